@@ -0,0 +1 @@
+"""Benchmarks for the Canvas LMS integration."""
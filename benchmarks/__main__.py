@@ -0,0 +1,182 @@
+"""
+Benchmark the Canvas LMS client and coordinator against a fake Canvas.
+
+Run from the repository root with ``scripts/benchmark``; pass ``--help`` to
+see the data volumes and faults that can be configured.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import fields
+from typing import Any
+
+import aiohttp
+from homeassistant import config_entries
+from homeassistant.const import CONF_ACCESS_TOKEN
+from homeassistant.core import HomeAssistant
+
+from custom_components.canvas_lms.api import CanvasLmsApiClient
+from custom_components.canvas_lms.const import (
+    CONF_CANVAS_URL,
+    CONF_OBSERVEES,
+    CONF_TRANSPORT,
+    DEFAULT_TRANSPORT,
+    DOMAIN,
+    TRANSPORT_GRAPHQL,
+    TRANSPORT_REST,
+)
+from custom_components.canvas_lms.coordinator import CanvasLmsDataUpdateCoordinator
+from custom_components.canvas_lms.sensor import ENTITY_DESCRIPTIONS, CanvasLmsSensor
+
+from .fake_canvas import FakeCanvas, FakeCanvasConfig
+
+
+async def async_benchmark(
+    config: FakeCanvasConfig, iterations: int, transport: str = DEFAULT_TRANSPORT
+) -> list[dict[str, Any]]:
+    """Refresh a coordinator against the fake Canvas and measure every refresh."""
+    results: list[dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as config_dir:
+        async with FakeCanvas(config) as canvas, aiohttp.ClientSession() as session:
+            hass = HomeAssistant(config_dir)
+            entry = config_entries.ConfigEntry(
+                version=2,
+                minor_version=1,
+                domain=DOMAIN,
+                title="Benchmark",
+                data={
+                    CONF_CANVAS_URL: canvas.base_url,
+                    CONF_ACCESS_TOKEN: "benchmark",
+                    CONF_OBSERVEES: {
+                        str(observee["id"]): observee["name"]
+                        for observee in canvas.observees
+                    },
+                },
+                options={CONF_TRANSPORT: transport},
+                source=config_entries.SOURCE_USER,
+                unique_id=None,
+            )
+            config_entries.current_entry.set(entry)
+            client = CanvasLmsApiClient(
+                canvas_base_url=canvas.base_url,
+                api_key=f"benchmark-{id(canvas)}",
+                session=session,
+            )
+            coordinator = CanvasLmsDataUpdateCoordinator(hass=hass, client=client)
+            entities = [
+                CanvasLmsSensor(coordinator, description, entry, observee_id)
+                for observee_id in coordinator.observees
+                for description in ENTITY_DESCRIPTIONS
+            ]
+            coordinator.entities.extend(entities)
+
+            tracemalloc.start()
+            try:
+                for iteration in range(iterations):
+                    canvas.stats.reset()
+                    coordinator.async_mark_due()
+                    # Every iteration goes to the fake Canvas, not the memo.
+                    client.forget_memoized()
+                    tracemalloc.reset_peak()
+
+                    started = time.perf_counter()
+                    await coordinator.async_refresh()
+                    refresh_seconds = time.perf_counter() - started
+                    _, peak_memory = tracemalloc.get_traced_memory()
+
+                    started = time.perf_counter()
+                    attributes_bytes = 0
+                    for entity in entities:
+                        entity._attr_extra_state_attributes = (  # noqa: SLF001
+                            entity._build_extra_state_attributes()  # noqa: SLF001
+                        )
+                        attributes_bytes += len(
+                            json.dumps(entity.extra_state_attributes)
+                        )
+                    attributes_seconds = time.perf_counter() - started
+
+                    results.append(
+                        {
+                            "iteration": iteration,
+                            "success": coordinator.last_update_success,
+                            "refresh_ms": refresh_seconds * 1000,
+                            "requests": canvas.stats.requests,
+                            "not_modified": canvas.stats.not_modified,
+                            "throttled": canvas.stats.throttled,
+                            "errors": canvas.stats.errors,
+                            "bytes_sent": canvas.stats.bytes_sent,
+                            "peak_memory_bytes": peak_memory,
+                            "attributes_ms": attributes_seconds * 1000,
+                            "attributes_bytes": attributes_bytes,
+                        }
+                    )
+            finally:
+                tracemalloc.stop()
+                await hass.async_stop(force=True)
+    return results
+
+
+def _summary(results: list[dict[str, Any]]) -> str:
+    """Format the results as a table with a median row."""
+    columns = [key for key in results[0] if key != "iteration"]
+    lines = ["iteration " + " ".join(f"{column:>17}" for column in columns)]
+    lines.extend(
+        f"{result['iteration']:>9} "
+        + " ".join(f"{result[column]:>17.6g}" for column in columns)
+        for result in results
+    )
+    lines.append(
+        f"{'median':>9} "
+        + " ".join(
+            f"{statistics.median(float(r[column]) for r in results):>17.6g}"
+            for column in columns
+        )
+    )
+    return "\n".join(lines) + "\n"
+
+
+def main() -> None:
+    """Parse the command line and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="print raw JSON results")
+    parser.add_argument(
+        "--transport",
+        choices=(TRANSPORT_REST, TRANSPORT_GRAPHQL),
+        default=DEFAULT_TRANSPORT,
+    )
+    defaults = FakeCanvasConfig()
+    for config_field in fields(FakeCanvasConfig):
+        default = getattr(defaults, config_field.name)
+        option = f"--{config_field.name.replace('_', '-')}"
+        if isinstance(default, bool):
+            parser.add_argument(
+                option, action=argparse.BooleanOptionalAction, default=default
+            )
+        else:
+            parser.add_argument(option, type=type(default), default=default)
+    args = parser.parse_args()
+
+    config = FakeCanvasConfig(
+        **{
+            config_field.name: getattr(args, config_field.name)
+            for config_field in fields(FakeCanvasConfig)
+        }
+    )
+    results = asyncio.run(async_benchmark(config, args.iterations, args.transport))
+    if args.json:
+        sys.stdout.write(json.dumps(results, indent=2) + "\n")
+    else:
+        sys.stdout.write(_summary(results))
+
+
+if __name__ == "__main__":
+    main()
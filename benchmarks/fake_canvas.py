@@ -0,0 +1,526 @@
+"""Local stand-in for the Canvas REST API used by the benchmarks."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any, Self
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+    from types import TracebackType
+
+    from yarl import URL
+
+SELF_USER_ID = 1
+FIRST_OBSERVEE_ID = 100
+RATE_LIMIT_CAPACITY = 700.0
+RATE_LIMIT_LEAK_RATE = 10.0
+
+
+@dataclass
+class FakeCanvasConfig:
+    """Data volumes and fault injection of the fake Canvas."""
+
+    observees: int = 1
+    courses: int = 8
+    missing_submissions: int = 60
+    planner_items: int = 40
+    calendar_events: int = 30
+    announcements: int = 12
+    conversations: int = 20
+    description_bytes: int = 2000
+    syllabus_bytes: int = 20000
+    default_page_size: int = 10
+    max_page_size: int = 100
+    latency: float = 0.0
+    etag: bool = True
+    rate_limit_headers: bool = True
+    throttle_rate: float = 0.0
+    error_rate: float = 0.0
+    seed: int = 0
+
+
+@dataclass
+class FakeCanvasStats:
+    """Traffic served by the fake Canvas."""
+
+    requests: int = 0
+    not_modified: int = 0
+    throttled: int = 0
+    errors: int = 0
+    bytes_sent: int = 0
+    paths: dict[str, int] = field(default_factory=dict)
+
+    def reset(self) -> None:
+        """Start counting from zero."""
+        self.requests = self.not_modified = self.throttled = self.errors = 0
+        self.bytes_sent = 0
+        self.paths = {}
+
+
+def _course(course_id: int, config: FakeCanvasConfig) -> dict[str, Any]:
+    """Build a Canvas course object."""
+    return {
+        "id": course_id,
+        "name": f"Course {course_id}",
+        "friendly_name": f"Friendly course {course_id}",
+        "original_name": f"Original course {course_id}",
+        "course_code": f"C{course_id}",
+        "workflow_state": "available",
+        "updated_at": "2024-08-01T12:00:00Z",
+        "teachers": [{"id": course_id * 10, "display_name": f"Teacher {course_id}"}],
+        "calendar": {"ics": f"https://canvas.invalid/feeds/calendars/{course_id}.ics"},
+        "term": {"id": 1, "name": "Fall", "start_at": None, "end_at": None},
+        "syllabus_body": "<p>" + "s" * config.syllabus_bytes + "</p>",
+    }
+
+
+class FakeCanvas:
+    """A local aiohttp server that answers the Canvas endpoints we use."""
+
+    def __init__(self, config: FakeCanvasConfig) -> None:
+        """Generate the fake data."""
+        self.config = config
+        self.stats = FakeCanvasStats()
+        self._random = random.Random(config.seed)  # noqa: S311
+        self._bucket = RATE_LIMIT_CAPACITY
+        self._bucket_updated_at = time.monotonic()
+        self._server: TestServer | None = None
+
+        self.observees = [
+            {"id": FIRST_OBSERVEE_ID + index, "name": f"Student {index + 1}"}
+            for index in range(config.observees)
+        ]
+        self.courses: dict[int, list[dict[str, Any]]] = {}
+        self.missing_submissions: dict[int, list[dict[str, Any]]] = {}
+        self.planner_items: dict[int, list[dict[str, Any]]] = {}
+        self.announcements: list[dict[str, Any]] = []
+        self.conversations: list[dict[str, Any]] = []
+        now = datetime.now(UTC).replace(microsecond=0)
+        today = datetime.now(UTC).replace(hour=0, minute=0, second=0, microsecond=0)
+        for observee in self.observees:
+            base = observee["id"] * 1000
+            courses = [_course(base + index, config) for index in range(config.courses)]
+            self.courses[observee["id"]] = courses
+            self.missing_submissions[observee["id"]] = [
+                {
+                    "id": base * 100 + index,
+                    "name": f"Assignment {index}",
+                    "description": "<p>" + "d" * config.description_bytes + "</p>",
+                    "due_at": "2024-09-01T23:59:00Z",
+                    "lock_at": "2024-09-08T23:59:00Z",
+                    "course": {
+                        key: value
+                        for key, value in courses[index % len(courses)].items()
+                        if key != "syllabus_body"
+                    }
+                    if courses
+                    else {},
+                }
+                for index in range(config.missing_submissions)
+            ]
+            self.planner_items[observee["id"]] = [
+                {
+                    "plannable_id": base * 100 + index,
+                    "plannable_type": "assignment",
+                    "plannable_date": (
+                        today + timedelta(days=index % 21, hours=17)
+                    ).isoformat(),
+                    "course_id": courses[index % len(courses)]["id"]
+                    if courses
+                    else None,
+                    "context_name": f"Course {index % max(1, len(courses))}",
+                    "html_url": f"/courses/1/assignments/{base * 100 + index}",
+                    "plannable": {
+                        "title": f"Homework {index}",
+                        "updated_at": "2024-08-01T12:00:00Z",
+                    },
+                    "submissions": {
+                        "submitted": False,
+                        "missing": False,
+                        "graded": False,
+                    },
+                }
+                for index in range(config.planner_items)
+            ]
+            self.announcements += [
+                {
+                    "id": base * 100 + index,
+                    "title": f"Announcement {index}",
+                    "message": f"<p>Announcement {index} of course {course['id']}</p>",
+                    "posted_at": (now - timedelta(hours=5 * index)).isoformat(),
+                    "context_code": f"course_{course['id']}",
+                    "html_url": f"/courses/{course['id']}/discussion_topics/{index}",
+                    "author": {"display_name": f"Teacher {course['id']}"},
+                }
+                for index in range(config.announcements)
+                if (course := courses[index % len(courses)] if courses else None)
+            ]
+        courses = [course for items in self.courses.values() for course in items]
+        self.conversations = [
+            {
+                "id": index + 1,
+                "subject": f"Conversation {index}",
+                "workflow_state": "unread" if index % 3 == 0 else "read",
+                "last_message": f"Message {index}",
+                "last_message_at": (now - timedelta(hours=3 * index)).isoformat(),
+                "message_count": 1 + index % 4,
+                "context_code": f"course_{course['id']}",
+                "context_name": course["name"],
+            }
+            for index in range(config.conversations)
+            if (course := courses[index % len(courses)] if courses else None)
+        ]
+
+    @property
+    def base_url(self) -> str:
+        """Return the API base URL, as entered in the config flow."""
+        if self._server is None:
+            msg = "The fake Canvas is not running"
+            raise RuntimeError(msg)
+        return str(self._server.make_url("/api/"))
+
+    async def __aenter__(self) -> Self:
+        """Start the server on a free local port."""
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_get("/api/v1/users/{user_id}", self._user)
+        app.router.add_get("/api/v1/users/{user_id}/observees", self._observees)
+        app.router.add_get("/api/v1/users/{user_id}/courses", self._courses)
+        app.router.add_get(
+            "/api/v1/users/{user_id}/missing_submissions", self._missing_submissions
+        )
+        app.router.add_get("/api/v1/users/{user_id}/enrollments", self._enrollments)
+        app.router.add_get("/api/v1/planner/items", self._planner_items)
+        app.router.add_get("/api/v1/announcements", self._announcements)
+        app.router.add_get("/api/v1/conversations", self._conversations)
+        app.router.add_post("/api/graphql", self._graphql)
+        app.router.add_get("/api/v1/courses/{course_id}", self._course)
+        app.router.add_get("/feeds/calendars/{course_id}.ics", self._calendar_feed)
+        self._server = TestServer(app)
+        await self._server.start_server()
+        for courses in self.courses.values():
+            for course in courses:
+                course["calendar"]["ics"] = str(
+                    self._server.make_url(f"/feeds/calendars/{course['id']}.ics")
+                )
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Stop the server."""
+        if self._server is not None:
+            await self._server.close()
+            self._server = None
+
+    def _rate_limit_headers(self, cost: float) -> dict[str, str]:
+        """Charge a request to the leaky bucket and report its state."""
+        now = time.monotonic()
+        leaked = (now - self._bucket_updated_at) * RATE_LIMIT_LEAK_RATE
+        self._bucket = max(0.0, min(RATE_LIMIT_CAPACITY, self._bucket + leaked) - cost)
+        self._bucket_updated_at = now
+        return {
+            "X-Request-Cost": f"{cost:.4f}",
+            "X-Rate-Limit-Remaining": f"{self._bucket:.4f}",
+        }
+
+    @web.middleware
+    async def _middleware(
+        self,
+        request: web.Request,
+        handler: Callable[[web.Request], Awaitable[web.StreamResponse]],
+    ) -> web.StreamResponse:
+        """Inject latency and faults and count the traffic."""
+        self.stats.requests += 1
+        self.stats.paths[request.path] = self.stats.paths.get(request.path, 0) + 1
+        if self.config.latency:
+            await asyncio.sleep(self.config.latency)
+
+        headers = (
+            self._rate_limit_headers(1.0 + self._random.random())
+            if self.config.rate_limit_headers
+            else {}
+        )
+        if self._random.random() < self.config.throttle_rate:
+            self.stats.throttled += 1
+            headers["X-Rate-Limit-Remaining"] = "0.0"
+            return web.Response(
+                status=HTTPStatus.FORBIDDEN,
+                text="403 Forbidden (Rate Limit Exceeded)",
+                headers=headers,
+            )
+        if self._random.random() < self.config.error_rate:
+            self.stats.errors += 1
+            return web.Response(status=HTTPStatus.BAD_GATEWAY, headers=headers)
+
+        response = await handler(request)
+        response.headers.update(headers)
+        if response.status == HTTPStatus.NOT_MODIFIED:
+            self.stats.not_modified += 1
+        if isinstance(response, web.Response) and isinstance(response.body, bytes):
+            self.stats.bytes_sent += len(response.body)
+        return response
+
+    def _json(
+        self,
+        request: web.Request,
+        payload: Any,
+        links: dict[str, URL] | None = None,
+    ) -> web.Response:
+        """Answer with JSON, honouring If-None-Match when ETags are enabled."""
+        body = json.dumps(payload).encode()
+        headers = {}
+        if links:
+            headers["Link"] = ",".join(
+                f'<{url}>; rel="{rel}"' for rel, url in links.items()
+            )
+        if self.config.etag:
+            etag = f'"{hashlib.sha1(body).hexdigest()}"'  # noqa: S324
+            headers["ETag"] = etag
+            if request.headers.get("If-None-Match") == etag:
+                return web.Response(status=HTTPStatus.NOT_MODIFIED, headers=headers)
+        return web.Response(body=body, content_type="application/json", headers=headers)
+
+    def _page(self, request: web.Request, items: list[Any]) -> web.Response:
+        """Answer with one page of items and Canvas-style Link headers."""
+        page = int(request.query.get("page", "1"))
+        per_page = min(
+            int(request.query.get("per_page", self.config.default_page_size)),
+            self.config.max_page_size,
+        )
+        last_page = max(1, -(-len(items) // per_page))
+        links = {
+            "current": request.url.update_query(page=page),
+            "first": request.url.update_query(page=1),
+            "last": request.url.update_query(page=last_page),
+        }
+        if page < last_page:
+            links["next"] = request.url.update_query(page=page + 1)
+        if page > 1:
+            links["prev"] = request.url.update_query(page=page - 1)
+        start = (page - 1) * per_page
+        return self._json(request, items[start : start + per_page], links)
+
+    def _observee_id(self, request: web.Request) -> int:
+        """Resolve the user of the request path."""
+        user_id = request.match_info["user_id"]
+        if user_id == "self":
+            return SELF_USER_ID
+        if int(user_id) not in self.courses:
+            raise web.HTTPNotFound
+        return int(user_id)
+
+    async def _user(self, request: web.Request) -> web.Response:
+        """Answer GET /users/:id."""
+        user_id = self._observee_id(request)
+        return self._json(request, {"id": user_id, "name": f"User {user_id}"})
+
+    async def _observees(self, request: web.Request) -> web.Response:
+        """Answer GET /users/:id/observees."""
+        return self._page(request, self.observees)
+
+    async def _courses(self, request: web.Request) -> web.Response:
+        """Answer GET /users/:id/courses."""
+        courses = self.courses.get(self._observee_id(request), [])
+        if "syllabus_body" not in request.query.getall("include[]", []):
+            courses = [
+                {key: value for key, value in course.items() if key != "syllabus_body"}
+                for course in courses
+            ]
+        return self._page(request, courses)
+
+    async def _missing_submissions(self, request: web.Request) -> web.Response:
+        """Answer GET /users/:id/missing_submissions."""
+        return self._page(
+            request, self.missing_submissions.get(self._observee_id(request), [])
+        )
+
+    async def _enrollments(self, request: web.Request) -> web.Response:
+        """Answer GET /users/:id/enrollments with a grade per course."""
+        user_id = self._observee_id(request)
+        return self._page(
+            request,
+            [
+                {
+                    "id": course["id"] * 10,
+                    "course_id": course["id"],
+                    "user_id": user_id,
+                    "type": "StudentEnrollment",
+                    "enrollment_state": "active",
+                    "updated_at": course["updated_at"],
+                    "last_activity_at": course["updated_at"],
+                    "grades": {
+                        "html_url": f"https://canvas.invalid/courses/{course['id']}/grades",
+                        "current_score": 90.0,
+                        "current_grade": "A-",
+                        "final_score": 85.0,
+                        "final_grade": "B",
+                    },
+                }
+                for course in self.courses.get(user_id, [])
+            ],
+        )
+
+    async def _planner_items(self, request: web.Request) -> web.Response:
+        """Answer GET /planner/items for the observed user and date window."""
+        user_id = int(request.query.get("observed_user_id", FIRST_OBSERVEE_ID))
+        start = datetime.fromisoformat(request.query["start_date"])
+        end = datetime.fromisoformat(request.query["end_date"])
+        items = sorted(
+            (
+                item
+                for item in self.planner_items.get(user_id, [])
+                if start <= datetime.fromisoformat(item["plannable_date"]) < end
+            ),
+            key=lambda item: item["plannable_date"],
+        )
+        return self._page(request, items)
+
+    async def _announcements(self, request: web.Request) -> web.Response:
+        """Answer GET /announcements for the given courses and date range."""
+        context_codes = set(request.query.getall("context_codes[]", []))
+        start = datetime.fromisoformat(request.query["start_date"])
+        end = datetime.fromisoformat(request.query["end_date"]).replace(tzinfo=UTC)
+        items = [
+            item
+            for item in self.announcements
+            if item["context_code"] in context_codes
+            and start <= datetime.fromisoformat(item["posted_at"]) < end
+        ]
+        return self._page(request, items)
+
+    async def _conversations(self, request: web.Request) -> web.Response:
+        """Answer GET /conversations, the last message first."""
+        return self._page(
+            request,
+            sorted(
+                self.conversations,
+                key=lambda item: item["last_message_at"],
+                reverse=True,
+            ),
+        )
+
+    async def _calendar_feed(self, request: web.Request) -> web.Response:
+        """Answer GET /feeds/calendars/:id.ics with an iCalendar feed."""
+        course_id = int(request.match_info["course_id"])
+        first = datetime(2024, 9, 2, 15, tzinfo=UTC)
+        lines = ["BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//fake canvas//EN"]
+        for index in range(self.config.calendar_events):
+            start = first + timedelta(days=index, hours=course_id % 5)
+            lines.extend(
+                [
+                    "BEGIN:VEVENT",
+                    f"UID:event-{course_id}-{index}",
+                    f"DTSTART:{start:%Y%m%dT%H%M%SZ}",
+                    f"DTEND:{start + timedelta(hours=1):%Y%m%dT%H%M%SZ}",
+                    f"SUMMARY:Lesson {index}\\, course {course_id}",
+                    "DESCRIPTION:" + "x" * 100,
+                    " " + "y" * 100,
+                    "END:VEVENT",
+                ]
+            )
+        lines.append("END:VCALENDAR")
+        body = "\r\n".join(lines).encode()
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'  # noqa: S324
+        if self.config.etag and request.headers.get("If-None-Match") == etag:
+            return web.Response(status=HTTPStatus.NOT_MODIFIED, headers={"ETag": etag})
+        return web.Response(
+            body=body,
+            content_type="text/calendar",
+            headers={"ETag": etag} if self.config.etag else {},
+        )
+
+    def _graphql_user(self, user_id: int) -> dict[str, Any] | None:
+        """Build the GraphQL view of an observee used by the refresh query."""
+        if user_id not in self.courses:
+            return None
+        enrollments = []
+        for course in self.courses[user_id]:
+            missing = [
+                assignment
+                for assignment in self.missing_submissions[user_id]
+                if assignment["course"].get("id") == course["id"]
+            ]
+            enrollments.append(
+                {
+                    "type": "StudentEnrollment",
+                    "updatedAt": course["updated_at"],
+                    "lastActivityAt": course["updated_at"],
+                    "grades": {
+                        "currentScore": 90.0,
+                        "currentGrade": "A-",
+                        "finalScore": 85.0,
+                        "finalGrade": "B",
+                        "htmlUrl": f"https://canvas.invalid/courses/{course['id']}/grades",
+                    },
+                    "course": {
+                        "_id": str(course["id"]),
+                        "name": course["name"],
+                        "updatedAt": course["updated_at"],
+                        "term": {
+                            "_id": "1",
+                            "name": "Fall",
+                            "startAt": None,
+                            "endAt": None,
+                        },
+                        "teachers": {
+                            "nodes": [
+                                {"user": {"name": teacher["display_name"]}}
+                                for teacher in course["teachers"]
+                            ]
+                        },
+                        "submissionsConnection": {
+                            "pageInfo": {"hasNextPage": False},
+                            "nodes": [
+                                {
+                                    "missing": True,
+                                    "assignment": {
+                                        "_id": str(assignment["id"]),
+                                        "name": assignment["name"],
+                                        "description": assignment["description"],
+                                        "dueAt": assignment["due_at"],
+                                        "lockAt": assignment["lock_at"],
+                                    },
+                                }
+                                for assignment in missing
+                            ],
+                        },
+                    },
+                }
+            )
+        return {"enrollments": enrollments}
+
+    async def _graphql(self, request: web.Request) -> web.Response:
+        """Answer the refresh query of POST /graphql, one alias per observee."""
+        variables = (await request.json()).get("variables") or {}
+        return self._json(
+            request,
+            {
+                "data": {
+                    name.replace("user", "observee"): self._graphql_user(int(user_id))
+                    for name, user_id in variables.items()
+                }
+            },
+        )
+
+    async def _course(self, request: web.Request) -> web.Response:
+        """Answer GET /courses/:id."""
+        course_id = int(request.match_info["course_id"])
+        for courses in self.courses.values():
+            for course in courses:
+                if course["id"] == course_id:
+                    return self._json(request, course)
+        raise web.HTTPNotFound
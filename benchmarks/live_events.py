@@ -0,0 +1,83 @@
+"""
+Post Canvas Live Events to the push webhook of a Canvas LMS entry.
+
+A local stand-in for Canvas and the relay forwarding its events. Run from the
+repository root with ``scripts/push_event URL``; pass ``--help`` to see the
+events that can be sent.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import uuid
+from datetime import UTC, datetime
+from typing import Any
+
+import aiohttp
+
+from custom_components.canvas_lms.push import EVENT_KEYS
+
+from .fake_canvas import FIRST_OBSERVEE_ID
+
+
+def live_event(
+    event_name: str, user_id: int, course_id: int | None = None
+) -> dict[str, Any]:
+    """Build a Live Events payload about a student, in Canvas's envelope."""
+    body: dict[str, Any] = {"user_id": str(user_id)}
+    metadata: dict[str, Any] = {
+        "event_name": event_name,
+        "event_time": datetime.now(UTC).isoformat(timespec="milliseconds"),
+        "request_id": str(uuid.uuid4()),
+        "producer": "canvas",
+    }
+    if event_name == "grade_change":
+        # The actor of a grade change is the teacher, the student is in the body.
+        body = {"student_id": str(user_id), "grade": "A", "score": 10.0}
+        metadata["user_id"] = "1"
+    if course_id is not None:
+        body["course_id"] = str(course_id)
+        metadata["context_type"] = "Course"
+        metadata["context_id"] = str(course_id)
+    return {"metadata": metadata, "body": body}
+
+
+async def async_post_events(
+    url: str, events: list[dict[str, Any]], *, batch: bool = False
+) -> list[int]:
+    """Post events to a webhook, one request each or all in one batch."""
+    async with aiohttp.ClientSession() as session:
+        payloads: list[Any] = [events] if batch else events
+        statuses = []
+        for payload in payloads:
+            async with session.post(url, json=payload) as response:
+                statuses.append(response.status)
+        return statuses
+
+
+def main() -> None:
+    """Parse the command line and post the events."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "url", help="webhook URL, e.g. http://localhost:8123/api/webhook/<id>"
+    )
+    parser.add_argument(
+        "--event", choices=sorted(EVENT_KEYS), default="submission_created"
+    )
+    parser.add_argument("--user-id", type=int, default=FIRST_OBSERVEE_ID)
+    parser.add_argument("--course-id", type=int)
+    parser.add_argument("--count", type=int, default=1, help="events to post")
+    parser.add_argument("--batch", action="store_true", help="post all in one request")
+    args = parser.parse_args()
+
+    events = [
+        live_event(args.event, args.user_id, args.course_id) for _ in range(args.count)
+    ]
+    statuses = asyncio.run(async_post_events(args.url, events, batch=args.batch))
+    sys.stdout.write(" ".join(str(status) for status in statuses) + "\n")
+
+
+if __name__ == "__main__":
+    main()
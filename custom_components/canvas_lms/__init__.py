@@ -7,24 +7,89 @@ https://github.com/ludeeus/integration_blueprint
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
+from homeassistant.config_entries import ConfigEntryState
 from homeassistant.const import CONF_ACCESS_TOKEN, Platform
+from homeassistant.core import callback
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .api import CanvasLmsApiClient
-from .const import CONF_CANVAS_URL, DOMAIN
+from .const import (
+    CONF_CANVAS_URL,
+    CONF_OBSERVEE,
+    CONF_OBSERVEES,
+    DOMAIN,
+    LOGGER,
+    Courses,
+    MissingAssignments,
+)
 from .coordinator import CanvasLmsDataUpdateCoordinator
+from .push import async_update_webhook
+from .services import async_setup_services
+from .store import CanvasLmsSnapshotStore
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.typing import ConfigType
 
     from .data import CanvasLmsConfigEntry
 
 PLATFORMS: list[Platform] = [
+    Platform.CALENDAR,
     Platform.SENSOR,
 ]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:  # noqa: ARG001
+    """Set up the Canvas LMS services."""
+    async_setup_services(hass)
+    return True
+
+
+def _client_key(entry: CanvasLmsConfigEntry) -> tuple[str, str]:
+    """Return the Canvas host and token an entry connects with."""
+    return (entry.data[CONF_CANVAS_URL], entry.data[CONF_ACCESS_TOKEN])
+
+
+@callback
+def _async_get_client(
+    hass: HomeAssistant,
+    entry: CanvasLmsConfigEntry,
+) -> CanvasLmsApiClient:
+    """Return the API client shared by every entry using the same host and token."""
+    clients: dict[tuple[str, str], CanvasLmsApiClient] = hass.data.setdefault(
+        DOMAIN, {}
+    )
+    key = _client_key(entry)
+    if (client := clients.get(key)) is None:
+        client = clients[key] = CanvasLmsApiClient(
+            canvas_base_url=entry.data[CONF_CANVAS_URL],
+            api_key=entry.data[CONF_ACCESS_TOKEN],
+            session=async_get_clientsession(hass),
+        )
+    return client
+
+
+@callback
+def _async_release_client(
+    hass: HomeAssistant,
+    entry: CanvasLmsConfigEntry,
+) -> None:
+    """Drop the shared API client once no other loaded entry uses it."""
+    key = _client_key(entry)
+    if not any(
+        other.entry_id != entry.entry_id
+        and other.state is ConfigEntryState.LOADED
+        and _client_key(other) == key
+        for other in hass.config_entries.async_entries(DOMAIN)
+    ):
+        hass.data.get(DOMAIN, {}).pop(key, None)
+
 
 # https://developers.home-assistant.io/docs/config_entries_index/#setting-up-an-entry
 async def async_setup_entry(
@@ -32,23 +97,27 @@ async def async_setup_entry(
     entry: CanvasLmsConfigEntry,
 ) -> bool:
     """Set up this integration using UI."""
-    client = CanvasLmsApiClient(
-        canvas_base_url=entry.data[CONF_CANVAS_URL],
-        apiKey=entry.data[CONF_ACCESS_TOKEN],
-        session=async_get_clientsession(hass),
-    )
     coordinator = CanvasLmsDataUpdateCoordinator(
         hass=hass,
-        client=client,
+        client=_async_get_client(hass, entry),
     )
+    entry.runtime_data = coordinator
 
-    # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
-    await coordinator.async_config_entry_first_refresh()
-    hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN] = coordinator
+    # Start from the last persisted data when there is some.
+    restored = await coordinator.async_restore_snapshot()
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+    async_update_webhook(hass, entry)
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
+
+    # The entities added above describe the data keys to fetch. With restored
+    # data the refresh runs in the background so setup does not wait on Canvas.
+    if restored:
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} refresh {entry.entry_id}"
+        )
+    else:
+        await coordinator.async_refresh()
 
     return True
 
@@ -58,13 +127,66 @@ async def async_unload_entry(
     entry: CanvasLmsConfigEntry,
 ) -> bool:
     """Handle removal of an entry."""
-    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
+        coordinator = entry.runtime_data
+        if (unregister_webhook := coordinator.unregister_webhook) is not None:
+            unregister_webhook()
+        await coordinator.async_shutdown()
+        _async_release_client(hass, entry)
+    return unload_ok
 
 
-async def async_reload_entry(
+async def async_update_options(
+    hass: HomeAssistant,
+    entry: CanvasLmsConfigEntry,
+) -> None:
+    """
+    Apply changed options without reloading the entry.
+
+    The coordinator, its data and the API client are kept. The refresh only
+    fetches the data keys the options made due, then every entity is written
+    again for its new availability, attribute limits and data.
+    """
+    coordinator = entry.runtime_data
+    if dict(entry.options) == coordinator.options:
+        # Only the entry data changed, such as the stored push webhook id.
+        return
+    coordinator.async_apply_options(entry.options)
+    async_update_webhook(hass, entry)
+    await coordinator.async_refresh()
+    coordinator.async_update_listeners()
+
+
+async def async_remove_entry(
     hass: HomeAssistant,
     entry: CanvasLmsConfigEntry,
 ) -> None:
-    """Reload config entry."""
-    await async_unload_entry(hass, entry)
-    await async_setup_entry(hass, entry)
+    """Remove the persisted snapshot of a deleted entry."""
+    await CanvasLmsSnapshotStore(hass, entry.entry_id).async_remove()
+
+
+async def async_migrate_entry(
+    hass: HomeAssistant,
+    entry: CanvasLmsConfigEntry,
+) -> bool:
+    """Migrate an entry to the current version."""
+    if entry.version == 1:
+        # Version 1 entries held a single observee, named after the entry.
+        observee_id = entry.data[CONF_OBSERVEE]
+        data = {key: value for key, value in entry.data.items() if key != CONF_OBSERVEE}
+        data[CONF_OBSERVEES] = {observee_id: entry.title}
+
+        @callback
+        def _async_migrate_unique_id(
+            entity_entry: er.RegistryEntry,
+        ) -> dict[str, Any] | None:
+            key = entity_entry.unique_id.removeprefix(entry.entry_id)
+            if key not in (Courses, MissingAssignments):
+                return None
+            return {"new_unique_id": f"{entry.entry_id}_{observee_id}_{key}"}
+
+        await er.async_migrate_entries(hass, entry.entry_id, _async_migrate_unique_id)
+        hass.config_entries.async_update_entry(entry, data=data, version=2)
+        LOGGER.debug("Migrated entry %s to version 2", entry.entry_id)
+
+    return True
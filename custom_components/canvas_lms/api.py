@@ -2,13 +2,89 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import random
 import socket
-from typing import Any
+import sys
+import time
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from email.utils import parsedate_to_datetime
+from functools import partial
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any, NotRequired, TypedDict
 
 import aiohttp
 import async_timeout
+from yarl import URL
 
-from .const import LOGGER
+try:
+    from orjson import loads as json_loads
+except ImportError:  # pragma: no cover
+    from json import loads as json_loads
+
+from .const import LOGGER, Courses, Grades, MissingAssignments
+from .ics import parse_ics_events
+from .metrics import CanvasLmsMetrics
+
+if TYPE_CHECKING:
+    from collections.abc import (
+        AsyncIterator,
+        Awaitable,
+        Callable,
+        Hashable,
+        Iterator,
+        Mapping,
+    )
+
+    from multidict import MultiDictProxy
+
+    from .metrics import EndpointMetrics
+
+# Largest page size Canvas honours for list endpoints.
+PAGE_SIZE = 100
+# Maximum number of pages fetched at once when the page count is known up front.
+PAGE_PREFETCH_LIMIT = 4
+# Maximum number of URLs whose validators and mapped bodies are kept.
+RESPONSE_CACHE_SIZE = 64
+REQUEST_TIMEOUT = 10.0
+# Identical GETs are shared while in flight and their results reused for a
+# short while, so bursts of refreshes, reloads and config flows coalesce.
+REQUEST_MEMO_TTL = 30.0
+REQUEST_MEMO_SIZE = 128
+# Canvas throttles each access token with a leaky bucket. These mirror the
+# hosted Canvas defaults: the bucket holds 700 units and leaks about 10 units
+# per second, and every request is charged a 50 unit pre-flight penalty.
+RATE_LIMIT_CAPACITY = 700.0
+RATE_LIMIT_LEAK_RATE = 10.0
+RATE_LIMIT_PREFLIGHT_COST = 50.0
+# Longest single pause before sending a request while the bucket refills.
+RATE_LIMIT_MAX_DELAY = 30.0
+# Attempts per request when Canvas answers with a throttling 403.
+RATE_LIMIT_MAX_ATTEMPTS = 3
+# Attempts per idempotent request on timeouts, connection errors and
+# transient HTTP statuses, with exponential backoff and full jitter between.
+RETRY_MAX_ATTEMPTS = 3
+RETRY_BACKOFF_BASE = 1.0
+RETRY_MAX_DELAY = 30.0
+RETRY_STATUSES = frozenset(
+    {
+        HTTPStatus.TOO_MANY_REQUESTS,
+        HTTPStatus.INTERNAL_SERVER_ERROR,
+        HTTPStatus.BAD_GATEWAY,
+        HTTPStatus.SERVICE_UNAVAILABLE,
+        HTTPStatus.GATEWAY_TIMEOUT,
+    }
+)
+# Consecutive communication failures that open a host's circuit breaker, and
+# how long requests to that host then fail fast before one probe is allowed.
+CIRCUIT_BREAKER_THRESHOLD = 5
+CIRCUIT_BREAKER_COOLDOWN = 300.0
 
 
 class CanvasLmsApiClientError(Exception):
@@ -27,14 +103,713 @@ class CanvasLmsApiClientAuthenticationError(
     """Exception to indicate an authentication error."""
 
 
+class CanvasLmsApiClientTransientError(
+    CanvasLmsApiClientCommunicationError,
+):
+    """Exception to indicate Canvas answered with a retryable status."""
+
+    def __init__(self, message: str, retry_after: float | None = None) -> None:
+        """Initialize the error with the delay Canvas asked for, if any."""
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CanvasLmsApiClientRateLimitError(
+    CanvasLmsApiClientCommunicationError,
+):
+    """Exception to indicate Canvas kept throttling the access token."""
+
+
+class CanvasLmsApiClientDeadlineError(
+    CanvasLmsApiClientError,
+):
+    """
+    Exception to indicate the refresh deadline passed.
+
+    ``partial`` holds the items of a paginated listing fetched before the
+    deadline, or None when nothing was fetched.
+    """
+
+    def __init__(self, message: str, partial: list[Any] | None = None) -> None:
+        """Initialize the exception."""
+        super().__init__(message)
+        self.partial = partial
+
+
+# Deadline, in time.monotonic() seconds, shared by every request of a refresh.
+_DEADLINE: ContextVar[float | None] = ContextVar("canvas_lms_deadline", default=None)
+
+
+@contextmanager
+def request_deadline(seconds: float) -> Iterator[None]:
+    """
+    Bound every request made within the block by one overall deadline.
+
+    Tasks created within the block inherit the deadline, so the pages and
+    keys of a refresh share its budget. Each request's timeout is cut to the
+    time left, and retries and rate-limit waits stop once it is spent.
+    """
+    token = _DEADLINE.set(time.monotonic() + seconds)
+    try:
+        yield
+    finally:
+        _DEADLINE.reset(token)
+
+
+def _remaining_time() -> float | None:
+    """Return the seconds left before the deadline, None without one."""
+    if (deadline := _DEADLINE.get()) is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def _raise_if_past_deadline(url: str | URL, needed: float = 0.0) -> None:
+    """Raise when the deadline leaves less than needed seconds."""
+    if (remaining := _remaining_time()) is not None and remaining <= needed:
+        msg = f"Refresh deadline exceeded before requesting {url}"
+        raise CanvasLmsApiClientDeadlineError(msg)
+
+
+async def _async_collect(items: AsyncIterator[Any]) -> list[Any]:
+    """Collect a paginated listing, keeping the pages fetched before a deadline."""
+    results: list[Any] = []
+    try:
+        async for item in items:
+            results.append(item)  # noqa: PERF401
+    except CanvasLmsApiClientDeadlineError as exception:
+        exception.partial = results
+        raise
+    return results
+
+
 def _verify_response_or_raise(response: aiohttp.ClientResponse) -> None:
-    """Verify that the response is valid."""
+    """
+    Verify that the response is valid.
+
+    Only ``RETRY_STATUSES`` raise a communication error, which is retried and
+    counted by the circuit breaker. Other error statuses are final.
+    """
     if response.status in (401, 403):
         msg = "Invalid credentials"
         raise CanvasLmsApiClientAuthenticationError(
             msg,
         )
-    response.raise_for_status()
+    if response.status in RETRY_STATUSES:
+        msg = f"Canvas answered {response.status} for {response.url}"
+        raise CanvasLmsApiClientTransientError(
+            msg, retry_after=_retry_after(response.headers)
+        )
+    if response.status >= HTTPStatus.BAD_REQUEST:
+        # Canvas answered and refused the request, retrying will not help and
+        # the host is not failing.
+        msg = f"Canvas answered {response.status} for {response.url}"
+        raise CanvasLmsApiClientError(msg)
+
+
+async def _async_is_throttled(response: aiohttp.ClientResponse) -> bool:
+    """Tell a Canvas throttling 403 apart from a credentials 403."""
+    if response.status != HTTPStatus.FORBIDDEN:
+        return False
+    remaining = _header_float(response.headers, "X-Rate-Limit-Remaining")
+    if remaining is not None and remaining <= 0:
+        return True
+    return "rate limit exceeded" in (await response.text()).lower()
+
+
+def _header_float(headers: Mapping[str, str], name: str) -> float | None:
+    """Return a numeric header value or None when missing or malformed."""
+    try:
+        return float(headers[name])
+    except (KeyError, ValueError):
+        return None
+
+
+def _retry_after(headers: Mapping[str, str]) -> float | None:
+    """Return the delay requested by a Retry-After header, in seconds."""
+    if (value := headers.get(aiohttp.hdrs.RETRY_AFTER)) is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(UTC)).total_seconds())
+
+
+def _retry_delay(attempt: int, retry_after: float | None) -> float:
+    """Return the pause before retry number attempt."""
+    if retry_after is not None:
+        return min(retry_after, RETRY_MAX_DELAY)
+    backoff = min(RETRY_MAX_DELAY, RETRY_BACKOFF_BASE * 2**attempt)
+    return random.uniform(0, backoff)  # noqa: S311
+
+
+class _CircuitBreaker:
+    """
+    Fail fast while a Canvas host keeps failing.
+
+    After ``CIRCUIT_BREAKER_THRESHOLD`` consecutive communication failures the
+    breaker opens and requests fail immediately. Once the cooldown has passed
+    a single probe request is let through; its success closes the breaker and
+    its failure keeps it open for another cooldown.
+    """
+
+    def __init__(self, host: str) -> None:
+        """Initialize the breaker."""
+        self._host = host
+        self._failures = 0
+        self._opened_at = 0.0
+
+    def check(self) -> None:
+        """Raise when requests to the host should fail fast."""
+        if self._failures < CIRCUIT_BREAKER_THRESHOLD:
+            return
+        now = time.monotonic()
+        if (remaining := self._opened_at + CIRCUIT_BREAKER_COOLDOWN - now) > 0:
+            msg = f"Canvas at {self._host} is unavailable, retrying in {remaining:.0f}s"
+            raise CanvasLmsApiClientCommunicationError(msg)
+        # Let this request through as the probe and keep the rest failing fast.
+        self._opened_at = now
+
+    def record_success(self) -> None:
+        """Close the breaker after the host answered."""
+        self._failures = 0
+
+    def record_failure(self) -> None:
+        """Count a communication failure, opening the breaker at the threshold."""
+        self._failures += 1
+        if self._failures >= CIRCUIT_BREAKER_THRESHOLD:
+            self._opened_at = time.monotonic()
+
+
+class _RateLimiter:
+    """
+    Client-side view of the Canvas leaky bucket for one access token.
+
+    The bucket level is taken from ``X-Rate-Limit-Remaining`` and the typical
+    request cost from ``X-Request-Cost``. Requests wait in line for the
+    bucket to refill whenever the estimated level would not cover another
+    request, so clients sharing a token pace themselves instead of bursting.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the limiter."""
+        self._remaining: float | None = None
+        self._updated_at = 0.0
+        self._cost = 0.0
+        self._lock = asyncio.Lock()
+
+    def _available(self, now: float) -> float:
+        """Estimate the bucket level at now, including what has leaked away."""
+        if self._remaining is None:
+            return RATE_LIMIT_CAPACITY
+        leaked = (now - self._updated_at) * RATE_LIMIT_LEAK_RATE
+        return min(RATE_LIMIT_CAPACITY, self._remaining + leaked)
+
+    async def async_wait(self) -> None:
+        """Wait until the bucket can take another request and reserve it."""
+        async with self._lock:
+            needed = self._cost + RATE_LIMIT_PREFLIGHT_COST
+            available = self._available(time.monotonic())
+            if available < needed:
+                delay = min(
+                    (needed - available) / RATE_LIMIT_LEAK_RATE, RATE_LIMIT_MAX_DELAY
+                )
+                LOGGER.debug("Canvas rate limit low, delaying request %.1fs", delay)
+                await asyncio.sleep(delay)
+
+            now = time.monotonic()
+            self._remaining = self._available(now) - needed
+            self._updated_at = now
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        """Record the bucket state reported by Canvas."""
+        if (cost := _header_float(headers, "X-Request-Cost")) is not None:
+            self._cost = max(cost, self._cost * 0.8 + cost * 0.2)
+        if (remaining := _header_float(headers, "X-Rate-Limit-Remaining")) is not None:
+            self._remaining = remaining
+            self._updated_at = time.monotonic()
+
+    def throttled(self) -> None:
+        """Treat the bucket as empty after Canvas throttled a request."""
+        self._remaining = 0.0
+        self._updated_at = time.monotonic()
+
+
+# Canvas tracks the bucket per access token, so clients sharing a token share
+# one limiter, keyed by the token's digest. Limiters and breakers are dropped
+# once no client uses them, such as those of config flow validations.
+_RATE_LIMITERS: weakref.WeakValueDictionary[str, _RateLimiter] = (
+    weakref.WeakValueDictionary()
+)
+_CIRCUIT_BREAKERS: weakref.WeakValueDictionary[str, _CircuitBreaker] = (
+    weakref.WeakValueDictionary()
+)
+
+
+class _RequestCoalescer:
+    """
+    Single-flight execution and short-lived memoization of requests.
+
+    Callers asking for a key that is already being fetched await the same
+    task instead of sending a duplicate request. Successful results are kept
+    for ``REQUEST_MEMO_TTL`` seconds in a bounded LRU.
+    """
+
+    def __init__(
+        self, ttl: float = REQUEST_MEMO_TTL, max_size: int = REQUEST_MEMO_SIZE
+    ) -> None:
+        """Initialize the coalescer."""
+        self._ttl = ttl
+        self._max_size = max_size
+        self._in_flight: dict[Hashable, asyncio.Future[Any]] = {}
+        self._memo: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    async def async_run(
+        self, key: Hashable, request: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Return the result of request, shared with identical callers."""
+        if (memo := self._memo.get(key)) is not None:
+            expires_at, result = memo
+            if expires_at > time.monotonic():
+                self._memo.move_to_end(key)
+                return result
+            del self._memo[key]
+
+        if (task := self._in_flight.get(key)) is None:
+            # Callers with other deadlines may join, so the request runs
+            # without one and each caller stops waiting at its own instead.
+            context = copy_context()
+            context.run(_DEADLINE.set, None)
+            task = self._in_flight[key] = asyncio.get_running_loop().create_task(
+                request(), context=context
+            )
+            task.add_done_callback(partial(self._request_done, key))
+        # Shielded so one caller giving up does not cancel the others.
+        try:
+            async with async_timeout.timeout(_remaining_time()):
+                return await asyncio.shield(task)
+        except TimeoutError as exception:
+            msg = "Refresh deadline exceeded waiting for a shared request"
+            raise CanvasLmsApiClientDeadlineError(msg) from exception
+
+    def forget(self, predicate: Callable[[Hashable], bool]) -> None:
+        """Drop the memoized results whose key matches predicate."""
+        for key in [key for key in self._memo if predicate(key)]:
+            del self._memo[key]
+
+    def _request_done(self, key: Hashable, task: asyncio.Future[Any]) -> None:
+        """Forget the finished request and memoize its result."""
+        self._in_flight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        self._memo[key] = (time.monotonic() + self._ttl, task.result())
+        self._memo.move_to_end(key)
+        while len(self._memo) > self._max_size:
+            self._memo.popitem(last=False)
+
+
+_REQUEST_COALESCER = _RequestCoalescer()
+
+
+def _decode_body(
+    raw: bytes,
+    metrics: EndpointMetrics,
+    transform: Callable[[Any], Any] | None,
+    decode: Callable[[bytes], Any] = json_loads,
+) -> Any:
+    """Decode a response body, JSON by default, and map it, timing both steps."""
+    started = time.perf_counter()
+    body = decode(raw) if raw else None
+    decoded = time.perf_counter()
+    metrics.decode_seconds += decoded - started
+    if transform is not None:
+        body = transform(body)
+        metrics.mapping_seconds += time.perf_counter() - decoded
+    return body
+
+
+@dataclass(slots=True)
+class _CachedResponse:
+    """A mapped response body together with its HTTP validators."""
+
+    etag: str | None
+    last_modified: str | None
+    body: Any
+    links: MultiDictProxy
+
+
+class _ResponseCache:
+    """
+    LRU cache of conditional-request validators and mapped bodies.
+
+    Entries are keyed by URL and the transform the body was mapped with, so
+    one URL mapped two ways never returns the wrong shape on a 304.
+    """
+
+    def __init__(self, max_size: int = RESPONSE_CACHE_SIZE) -> None:
+        """Initialize the cache."""
+        self._max_size = max_size
+        self._entries: OrderedDict[Hashable, _CachedResponse] = OrderedDict()
+
+    def get(self, key: Hashable) -> _CachedResponse | None:
+        """Return the cached response for key and mark it as recently used."""
+        if (entry := self._entries.get(key)) is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: Hashable, entry: _CachedResponse) -> None:
+        """Store a response, evicting the least recently used one when full."""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def discard(self, key: Hashable) -> None:
+        """Forget the cached response for key."""
+        self._entries.pop(key, None)
+
+
+class MissingAssignment(TypedDict):
+    """A missing submission, as kept in the coordinator data."""
+
+    id: int
+    name: str
+    description: NotRequired[str | None]
+    due_date: str | None
+    locks_at: str | None
+    course: str | None
+    course_og_name: str | None
+
+
+class Course(TypedDict):
+    """A course, as kept in the coordinator data."""
+
+    id: int
+    name: str
+    friendlyName: str | None
+    teacher: str | None
+    calendar_ics: str | None
+    term: dict[str, Any] | None
+    updated_at: str | None
+
+
+def _intern(value: str | None) -> str | None:
+    """Share one copy of a string repeated across pages and refreshes."""
+    return None if value is None else sys.intern(value)
+
+
+def _map_missing_assignments(
+    assignments: list[Any], *, include_description: bool = True
+) -> list[MissingAssignment]:
+    """
+    Project a page of Canvas missing submissions onto compact records.
+
+    Canvas embeds the whole course in every submission. Only its names are
+    kept, decoded once per course and shared by every assignment of it.
+    """
+    course_names: dict[Any, tuple[str | None, str | None]] = {}
+    results: list[MissingAssignment] = []
+    for assignment in assignments:
+        course = assignment.get("course") or {}
+        if (names := course_names.get(course.get("id"))) is None:
+            names = course_names[course.get("id")] = (
+                _intern(course.get("name")),
+                _intern(course.get("original_name")),
+            )
+        record = MissingAssignment(
+            id=assignment["id"],
+            name=assignment["name"],
+            due_date=assignment["due_at"],
+            locks_at=assignment["lock_at"],
+            course=names[0],
+            course_og_name=names[1],
+        )
+        if include_description:
+            record["description"] = assignment.get("description")
+        results.append(record)
+    return results
+
+
+# Stable transforms, so responses mapped with or without descriptions are
+# cached and coalesced separately.
+_MISSING_ASSIGNMENT_MAPPERS = {
+    include_description: partial(
+        _map_missing_assignments, include_description=include_description
+    )
+    for include_description in (True, False)
+}
+
+
+def _map_courses(courses: list[Any]) -> list[Course]:
+    """Project a page of Canvas courses onto compact records."""
+    return [
+        Course(
+            id=course["id"],
+            name=course["name"],
+            friendlyName=course.get("friendly_name"),
+            teacher=_intern(
+                course["teachers"][0]["display_name"]
+                if course.get("teachers")
+                else None
+            ),
+            calendar_ics=(course.get("calendar") or {}).get("ics"),
+            term=course.get("term"),
+            updated_at=course.get("updated_at"),
+        )
+        for course in courses
+    ]
+
+
+def _map_grades(enrollments: list[Any]) -> list[dict[str, Any]]:
+    """Map a page of Canvas student enrollments to per-course grade records."""
+    results = []
+    for enrollment in enrollments:
+        grades = enrollment.get("grades") or {}
+        results.append(
+            {
+                "course_id": enrollment["course_id"],
+                "current_grade": grades.get("current_grade"),
+                "current_score": grades.get("current_score"),
+                "final_grade": grades.get("final_grade"),
+                "final_score": grades.get("final_score"),
+                "html_url": grades.get("html_url"),
+                "last_activity_at": enrollment.get("last_activity_at"),
+                "updated_at": enrollment.get("updated_at"),
+            }
+        )
+    return results
+
+
+def _utc_iso(value: str) -> str:
+    """Normalize a Canvas timestamp to a sortable UTC ISO string."""
+    return datetime.fromisoformat(value).astimezone(UTC).isoformat(timespec="seconds")
+
+
+def _map_planner_items(items: list[Any]) -> list[dict[str, Any]]:
+    """Map a page of Canvas planner items to the integration's records."""
+    results = []
+    for item in items:
+        plannable = item.get("plannable") or {}
+        submissions = item.get("submissions") or {}
+        results.append(
+            {
+                "id": item["plannable_id"],
+                "type": item["plannable_type"],
+                "title": plannable.get("title"),
+                "course_id": item.get("course_id"),
+                "context_name": item.get("context_name"),
+                "due_at": _utc_iso(item["plannable_date"]),
+                "updated_at": plannable.get("updated_at"),
+                "html_url": item.get("html_url"),
+                "submitted": submissions.get("submitted", False),
+                "missing": submissions.get("missing", False),
+                "graded": submissions.get("graded", False),
+            }
+        )
+    return results
+
+
+def _course_id(context_code: str | None) -> int | None:
+    """Return the course id of a ``course_<id>`` context code."""
+    course_id = (context_code or "").removeprefix("course_")
+    return int(course_id) if course_id.isdigit() else None
+
+
+def _map_announcements(announcements: list[Any]) -> list[dict[str, Any]]:
+    """Map a page of Canvas announcements to the integration's records."""
+    return [
+        {
+            "id": announcement["id"],
+            "title": announcement.get("title"),
+            "message": announcement.get("message"),
+            "posted_at": _utc_iso(announcement["posted_at"])
+            if announcement.get("posted_at")
+            else None,
+            "course_id": _course_id(announcement.get("context_code")),
+            "author": _intern((announcement.get("author") or {}).get("display_name")),
+            "html_url": announcement.get("html_url"),
+        }
+        for announcement in announcements
+    ]
+
+
+def _map_conversations(conversations: list[Any]) -> list[dict[str, Any]]:
+    """Map a page of Canvas conversations to the integration's records."""
+    return [
+        {
+            "id": conversation["id"],
+            "subject": conversation.get("subject"),
+            "last_message": conversation.get("last_message"),
+            "last_message_at": _utc_iso(conversation["last_message_at"])
+            if conversation.get("last_message_at")
+            else None,
+            "message_count": conversation.get("message_count"),
+            "unread": conversation.get("workflow_state") == "unread",
+            "context_code": _intern(conversation.get("context_code")),
+            "context_name": _intern(conversation.get("context_name")),
+        }
+        for conversation in conversations
+    ]
+
+
+# Data keys the GraphQL transport returns for every observee in one query.
+GRAPHQL_KEYS = frozenset({Courses, Grades, MissingAssignments})
+GRAPHQL_PAGE_SIZE = 100
+
+_GRAPHQL_OBSERVEE_FIELDS = """
+  ... on User {
+    enrollments(currentOnly: true) {
+      type
+      updatedAt
+      lastActivityAt
+      grades { currentScore currentGrade finalScore finalGrade htmlUrl }
+      course {
+        _id
+        name
+        updatedAt
+        term { _id name startAt endAt }
+        teachers: enrollmentsConnection(
+          filter: { types: [TeacherEnrollment] }, first: 1
+        ) { nodes { user { name } } }
+        submissionsConnection(
+          studentIds: [$user%(index)d]
+          filter: { states: [unsubmitted] }
+          first: %(page_size)d
+        ) {
+          pageInfo { hasNextPage }
+          nodes { missing assignment { _id name %(description)s dueAt lockAt } }
+        }
+      }
+    }
+  }
+"""
+
+
+def _graphql_query(user_count: int, *, include_description: bool) -> str:
+    """Build one query reading every observee, each under its own alias."""
+    variables = ", ".join(f"$user{index}: ID!" for index in range(user_count))
+    selections = "\n".join(
+        f"observee{index}: legacyNode(_id: $user{index}, type: User) {{"
+        + _GRAPHQL_OBSERVEE_FIELDS
+        % {
+            "index": index,
+            "page_size": GRAPHQL_PAGE_SIZE,
+            "description": "description" if include_description else "",
+        }
+        + "}"
+        for index in range(user_count)
+    )
+    return f"query CanvasLmsRefresh({variables}) {{\n{selections}\n}}"
+
+
+def _map_graphql_observee(
+    user: dict[str, Any] | None, *, include_description: bool
+) -> dict[str, list[Any]]:
+    """Map one observee of a GraphQL refresh onto the REST record shapes."""
+    if user is None:
+        msg = "Canvas GraphQL did not return the observee"
+        raise CanvasLmsApiClientError(msg)
+
+    courses: list[Course] = []
+    grades: list[dict[str, Any]] = []
+    missing: list[MissingAssignment] = []
+    for enrollment in user.get("enrollments") or []:
+        course = enrollment.get("course")
+        if enrollment.get("type") != "StudentEnrollment" or not course:
+            continue
+        course_id = int(course["_id"])
+        name = _intern(course.get("name"))
+        # Null when the observer cannot read the teacher list.
+        teachers = (course.get("teachers") or {}).get("nodes") or []
+        term = course.get("term")
+        courses.append(
+            Course(
+                id=course_id,
+                name=course["name"],
+                friendlyName=None,
+                teacher=_intern((teachers[0].get("user") or {}).get("name"))
+                if teachers
+                else None,
+                calendar_ics=None,
+                term={
+                    "id": int(term["_id"]),
+                    "name": term.get("name"),
+                    "start_at": term.get("startAt"),
+                    "end_at": term.get("endAt"),
+                }
+                if term
+                else None,
+                updated_at=course.get("updatedAt"),
+            )
+        )
+        enrollment_grades = enrollment.get("grades") or {}
+        grades.append(
+            {
+                "course_id": course_id,
+                "current_grade": enrollment_grades.get("currentGrade"),
+                "current_score": enrollment_grades.get("currentScore"),
+                "final_grade": enrollment_grades.get("finalGrade"),
+                "final_score": enrollment_grades.get("finalScore"),
+                "html_url": enrollment_grades.get("htmlUrl"),
+                "last_activity_at": enrollment.get("lastActivityAt"),
+                "updated_at": enrollment.get("updatedAt"),
+            }
+        )
+        submissions = course.get("submissionsConnection") or {}
+        if (submissions.get("pageInfo") or {}).get("hasNextPage"):
+            # A partial list would silently drop missing assignments.
+            msg = f"Too many unsubmitted assignments in course {course_id}"
+            raise CanvasLmsApiClientError(msg)
+        for submission in submissions.get("nodes") or []:
+            assignment = submission.get("assignment")
+            if not submission.get("missing") or not assignment:
+                continue
+            record = MissingAssignment(
+                id=int(assignment["_id"]),
+                name=assignment["name"],
+                due_date=assignment.get("dueAt"),
+                locks_at=assignment.get("lockAt"),
+                course=name,
+                # The GraphQL course has no original name.
+                course_og_name=None,
+            )
+            if include_description:
+                record["description"] = assignment.get("description")
+            missing.append(record)
+    return {Courses: courses, Grades: grades, MissingAssignments: missing}
+
+
+def _decode_text(raw: bytes) -> str:
+    """Decode a text response body."""
+    return raw.decode("utf-8", errors="replace")
+
+
+def _map_ics_events(text: str | None) -> list[dict[str, Any]]:
+    """Parse the events of a calendar feed line by line."""
+    return parse_ics_events(text.splitlines()) if text else []
+
+
+def _remaining_page_urls(links: MultiDictProxy) -> list[URL] | None:
+    """
+    Build the URLs of pages 2..N from the ``last`` link.
+
+    Returns ``None`` when Canvas does not expose a numbered ``last`` page
+    (for example bookmark-based pagination), in which case the caller has to
+    walk the ``next`` links instead.
+    """
+    if (last_link := links.get("last")) is None:
+        return None if "next" in links else []
+
+    last_url: URL = last_link["url"]
+    last_page = last_url.query.get("page", "")
+    if not last_page.isdigit():
+        return None
+
+    return [last_url.update_query(page=page) for page in range(2, int(last_page) + 1)]
 
 
 class CanvasLmsApiClient:
@@ -50,6 +825,21 @@ class CanvasLmsApiClient:
         self._canvas_base_url = canvas_base_url
         self._apiKey = api_key
         self._session = session
+        self._response_cache = _ResponseCache()
+        self.metrics = CanvasLmsMetrics()
+        # Shared state is keyed by the token's digest, never the token.
+        self._token_digest = hashlib.sha256(api_key.encode()).hexdigest()
+        self._rate_limiter = _RATE_LIMITERS.setdefault(
+            self._token_digest, _RateLimiter()
+        )
+        host = URL(canvas_base_url).host or canvas_base_url
+        self._circuit_breaker = _CIRCUIT_BREAKERS.setdefault(
+            host, _CircuitBreaker(host)
+        )
+
+    def forget_memoized(self) -> None:
+        """Make the next requests of this access token reach Canvas again."""
+        _REQUEST_COALESCER.forget(lambda key: key[2] == self._token_digest)
 
     async def async_get_user(self, user_id: str) -> Any:
         """Get the specified user."""
@@ -64,67 +854,275 @@ class CanvasLmsApiClient:
 
     async def async_get_observees(self, user_id: str) -> Any:
         """Get the observees for the specified user."""
-        return await self._api_wrapper(
+        return await _async_collect(
+            self._paginated_api_wrapper(
+                path=f"v1/users/{user_id}/observees",
+                headers={
+                    "Content-type": "application/json; charset=UTF-8",
+                    "Authorization": f"Bearer {self._apiKey}",
+                },
+            )
+        )
+
+    async def async_get_missing_assignments(
+        self, user_id: str, *, include_description: bool = True
+    ) -> list[MissingAssignment]:
+        """Get the missing assignments for specified user."""
+        return await _async_collect(
+            self._paginated_api_wrapper(
+                path=f"v1/users/{user_id}/missing_submissions?include[]=course&filter[]=submittable",
+                headers={
+                    "Content-type": "application/json; charset=UTF-8",
+                    "Authorization": f"Bearer {self._apiKey}",
+                },
+                transform=_MISSING_ASSIGNMENT_MAPPERS[include_description],
+            )
+        )
+
+    async def async_get_courses(self, user_id: str) -> Any:
+        """Get courses for specified user."""
+        results = await _async_collect(
+            self._paginated_api_wrapper(
+                path=f"v1/users/{user_id}/courses?include[]=teachers&include[]=term&enrollment_state=active",
+                headers={
+                    "Content-type": "application/json; charset=UTF-8",
+                    "Authorization": f"Bearer {self._apiKey}",
+                },
+                transform=_map_courses,
+            )
+        )
+
+        LOGGER.debug("mapped courses to results %s", results)
+        return results
+
+    async def async_get_grades(self, user_id: str) -> Any:
+        """
+        Get the current grades of specified user in each active course.
+
+        Canvas reports the grades on the user's student enrollments, so all
+        courses are covered by one paginated request.
+        """
+        return await _async_collect(
+            self._paginated_api_wrapper(
+                path=f"v1/users/{user_id}/enrollments?type[]=StudentEnrollment&state[]=active",
+                headers={
+                    "Content-type": "application/json; charset=UTF-8",
+                    "Authorization": f"Bearer {self._apiKey}",
+                },
+                transform=_map_grades,
+            )
+        )
+
+    async def async_get_planner_items(
+        self,
+        user_id: str,
+        course_ids: list[int],
+        start: datetime,
+        end: datetime,
+    ) -> Any:
+        """Get the planner items of specified user due between start and end."""
+        query: dict[str, Any] = {
+            "start_date": start.astimezone(UTC).isoformat(timespec="seconds"),
+            "end_date": end.astimezone(UTC).isoformat(timespec="seconds"),
+            "order": "asc",
+            "context_codes[]": [f"course_{course_id}" for course_id in course_ids],
+        }
+        if user_id != "self":
+            query["observed_user_id"] = user_id
+        return await _async_collect(
+            self._paginated_api_wrapper(
+                path=str(URL("v1/planner/items").with_query(query)),
+                headers={
+                    "Content-type": "application/json; charset=UTF-8",
+                    "Authorization": f"Bearer {self._apiKey}",
+                },
+                transform=_map_planner_items,
+            )
+        )
+
+    async def async_get_announcements(
+        self, course_ids: list[int], since: datetime
+    ) -> Any:
+        """
+        Get the announcements of the given courses posted since a time.
+
+        All courses are covered by one paginated request. Canvas includes
+        announcements posted exactly at ``since``, callers deduplicate them.
+        """
+        if not course_ids:
+            return []
+        query: dict[str, Any] = {
+            "context_codes[]": [f"course_{course_id}" for course_id in course_ids],
+            "start_date": since.astimezone(UTC).isoformat(timespec="seconds"),
+            # Canvas ends the range 28 days after start_date by default.
+            "end_date": (datetime.now(UTC) + timedelta(days=1)).date().isoformat(),
+        }
+        return await _async_collect(
+            self._paginated_api_wrapper(
+                path=str(URL("v1/announcements").with_query(query)),
+                headers={
+                    "Content-type": "application/json; charset=UTF-8",
+                    "Authorization": f"Bearer {self._apiKey}",
+                },
+                transform=_map_announcements,
+            )
+        )
+
+    async def async_get_conversations(
+        self, since: str | None = None, limit: int | None = None
+    ) -> Any:
+        """
+        Get the newest inbox conversations, down to the last message at since.
+
+        Canvas lists conversations by their last message, newest first, so
+        pages are only requested until one reaches ``since``, or ``limit``
+        conversations when there is no cursor yet. The first page is always
+        requested, keeping the read state of recent conversations current.
+        """
+        results: list[Any] = []
+        url: str | URL | None = (
+            f"{self._canvas_base_url}v1/conversations?scope=inbox&per_page={PAGE_SIZE}"
+        )
+        while url is not None:
+            items, links = await self._api_request(
+                method="get",
+                url=url,
+                headers={
+                    "Content-type": "application/json; charset=UTF-8",
+                    "Authorization": f"Bearer {self._apiKey}",
+                },
+                transform=_map_conversations,
+            )
+            results.extend(items)
+            if (
+                not items
+                or (since is not None and (items[-1]["last_message_at"] or "") <= since)
+                or (limit is not None and len(results) >= limit)
+            ):
+                break
+            url = (links.get("next") or {}).get("url")
+        return results[:limit]
+
+    async def async_get_calendar_events(self, feed_url: str) -> Any:
+        """
+        Get the events of a course calendar feed.
+
+        Feeds are fetched conditionally and parsed only when they changed, a
+        ``304 Not Modified`` returns the events parsed last time.
+        """
+        events, _ = await self._api_request(
             method="get",
-            path=f"v1/users/{user_id}/observees",
+            url=feed_url,
+            transform=_map_ics_events,
+            decode=_decode_text,
+        )
+        return events
+
+    async def async_get_batch(
+        self, user_ids: list[str], *, include_description: bool = True
+    ) -> dict[str, dict[str, list[Any]]]:
+        """
+        Get the ``GRAPHQL_KEYS`` data of several users in one GraphQL request.
+
+        The result maps each user id to its data keys, in the same record
+        shapes as the REST methods. Fields GraphQL does not expose, such as
+        the calendar feed, are None. Errors reported in the GraphQL response
+        raise ``CanvasLmsApiClientError`` so callers can fall back to REST.
+        """
+        body = await self._api_wrapper(
+            method="post",
+            path="graphql",
+            data={
+                "query": _graphql_query(
+                    len(user_ids), include_description=include_description
+                ),
+                "variables": {
+                    f"user{index}": user_id for index, user_id in enumerate(user_ids)
+                },
+            },
             headers={
                 "Content-type": "application/json; charset=UTF-8",
                 "Authorization": f"Bearer {self._apiKey}",
             },
         )
+        if not isinstance(body, dict) or body.get("errors") or not body.get("data"):
+            msg = f"Canvas GraphQL query failed: {(body or {}).get('errors')}"
+            raise CanvasLmsApiClientError(msg)
+        return {
+            user_id: _map_graphql_observee(
+                body["data"].get(f"observee{index}"),
+                include_description=include_description,
+            )
+            for index, user_id in enumerate(user_ids)
+        }
 
-    async def async_get_missing_assignments(self, user_id: str) -> Any:
-        """Get the missing assignments for specified user."""
-        assignments = await self._api_wrapper(
+    async def async_get_syllabus(self, course_id: int) -> str | None:
+        """Get the syllabus HTML of the specified course."""
+        course = await self._api_wrapper(
             method="get",
-            path=f"v1/users/{user_id}/missing_submissions?include[]=course&filter[]=submittable",
+            path=f"v1/courses/{course_id}?include[]=syllabus_body",
             headers={
                 "Content-type": "application/json; charset=UTF-8",
                 "Authorization": f"Bearer {self._apiKey}",
             },
         )
+        return course.get("syllabus_body")
 
-        results = []
-        for assignment in assignments:
-            result = {
-                "id": assignment["id"],
-                "name": assignment["name"],
-                "description": assignment["description"],
-                "due_date": assignment["due_at"],
-                "locks_at": assignment["lock_at"],
-                "course": assignment["course"]["name"],
-                "course_og_name": assignment["course"]["original_name"],
-            }
-            results.append(result)
-
-        return results
+    async def _paginated_api_wrapper(
+        self,
+        path: str,
+        headers: dict | None = None,
+        transform: Callable[[Any], Any] | None = None,
+    ) -> AsyncIterator[Any]:
+        """
+        Yield every item of a paginated list endpoint.
 
-    async def async_get_courses(self, user_id: str) -> Any:
-        """Get courses for specified user."""
-        courses = await self._api_wrapper(
+        Canvas paginates list endpoints through the ``Link`` header. When the
+        ``last`` link carries a page number the remaining pages are fetched
+        concurrently (bounded by ``PAGE_PREFETCH_LIMIT``) and yielded in page
+        order, otherwise the ``next`` links are followed one at a time.
+        ``transform`` is applied to each page before its items are yielded.
+        """
+        separator = "&" if "?" in path else "?"
+        items, links = await self._api_request(
             method="get",
-            path=f"v1/users/{user_id}/courses?include[]=teachers&include[]=term&include[]=syllabus_body&enrollment_state=active",
-            headers={
-                "Content-type": "application/json; charset=UTF-8",
-                "Authorization": f"Bearer {self._apiKey}",
-            },
+            url=f"{self._canvas_base_url}{path}{separator}per_page={PAGE_SIZE}",
+            headers=headers,
+            transform=transform,
         )
+        for item in items:
+            yield item
 
-        results = []
-        for course in courses:
-            result = {
-                "id": course["id"],
-                "name": course["name"],
-                "friendlyName": course["friendly_name"],
-                "syllabus": course["syllabus_body"],
-                "teacher": course["teachers"][0]["display_name"],
-                "calendar_ics": course["calendar"]["ics"],
-                "term": course["term"],
-            }
-            results.append(result)
+        page_urls = _remaining_page_urls(links)
+        if page_urls is None:
+            while (next_link := links.get("next")) is not None:
+                items, links = await self._api_request(
+                    method="get",
+                    url=next_link["url"],
+                    headers=headers,
+                    transform=transform,
+                )
+                for item in items:
+                    yield item
+            return
 
-        LOGGER.info(f"mapped courses to results {results}")
-        return results
+        semaphore = asyncio.Semaphore(PAGE_PREFETCH_LIMIT)
+
+        async def _fetch_page(url: URL) -> Any:
+            async with semaphore:
+                page, _ = await self._api_request(
+                    method="get", url=url, headers=headers, transform=transform
+                )
+                return page
+
+        tasks = [asyncio.ensure_future(_fetch_page(url)) for url in page_urls]
+        try:
+            for task in tasks:
+                for item in await task:
+                    yield item
+        finally:
+            for task in tasks:
+                task.cancel()
 
     async def _api_wrapper(
         self,
@@ -134,18 +1132,189 @@ class CanvasLmsApiClient:
         headers: dict | None = None,
     ) -> Any:
         """Get information from the API."""
+        body, _ = await self._api_request(
+            method=method,
+            url=f"{self._canvas_base_url}{path}",
+            data=data,
+            headers=headers,
+        )
+        return body
+
+    async def _api_request(  # noqa: PLR0913
+        self,
+        method: str,
+        url: str | URL,
+        data: dict | None = None,
+        headers: dict | None = None,
+        *,
+        transform: Callable[[Any], Any] | None = None,
+        decode: Callable[[bytes], Any] = json_loads,
+    ) -> tuple[Any, MultiDictProxy]:
+        """
+        Perform a request and return the decoded body and its links.
+
+        Requests are paced by the shared per-token rate limiter and retried
+        when Canvas answers with a throttling 403. GET requests are also
+        retried on communication errors and transient statuses, honouring
+        ``Retry-After``, unless the host's circuit breaker is open.
+
+        GET responses carrying an ``ETag`` or ``Last-Modified`` validator are
+        cached after ``transform`` has been applied. Later requests for the
+        same URL are sent conditionally and a ``304 Not Modified`` returns the
+        cached body without decoding or mapping the payload again.
+
+        Concurrent identical GETs for the same token share one request, and
+        its result is reused for ``REQUEST_MEMO_TTL`` seconds. The shared
+        request runs without a deadline, each caller waits until its own.
+        """
+        request = partial(
+            self._async_request_with_retries,
+            method=method,
+            url=url,
+            data=data,
+            headers=headers,
+            transform=transform,
+            decode=decode,
+        )
+        if method != "get":
+            return await request()
+        _raise_if_past_deadline(url)
+        return await _REQUEST_COALESCER.async_run(
+            (method, str(url), self._token_digest, transform, decode), request
+        )
+
+    async def _async_request_with_retries(  # noqa: PLR0913
+        self,
+        *,
+        method: str,
+        url: str | URL,
+        data: dict | None,
+        headers: dict | None,
+        transform: Callable[[Any], Any] | None,
+        decode: Callable[[bytes], Any],
+    ) -> tuple[Any, MultiDictProxy]:
+        """Send a request, pacing, retrying and failing fast as configured."""
+        attempts = RETRY_MAX_ATTEMPTS if method == "get" else 1
+        failures = 0
+        throttles = 0
+        while True:
+            self._circuit_breaker.check()
+            _raise_if_past_deadline(url)
+            try:
+                async with async_timeout.timeout(_remaining_time()):
+                    await self._rate_limiter.async_wait()
+            except TimeoutError as exception:
+                msg = f"Refresh deadline exceeded waiting to request {url}"
+                raise CanvasLmsApiClientDeadlineError(msg) from exception
+            try:
+                result = await self._async_send(
+                    method=method,
+                    url=url,
+                    data=data,
+                    headers=headers,
+                    transform=transform,
+                    decode=decode,
+                )
+            except CanvasLmsApiClientCommunicationError as exception:
+                self._circuit_breaker.record_failure()
+                failures += 1
+                if failures >= attempts:
+                    raise
+                delay = _retry_delay(failures, getattr(exception, "retry_after", None))
+                _raise_if_past_deadline(url, delay)
+                LOGGER.debug("Retrying %s in %.1fs: %s", url, delay, exception)
+                await asyncio.sleep(delay)
+                continue
+
+            self._circuit_breaker.record_success()
+            if result is not None:
+                return result
+            throttles += 1
+            if throttles >= RATE_LIMIT_MAX_ATTEMPTS:
+                msg = f"Canvas rate limit exceeded for {url}"
+                raise CanvasLmsApiClientRateLimitError(msg)
+
+    def _cache_response(
+        self,
+        method: str,
+        cache_key: Hashable,
+        response: aiohttp.ClientResponse,
+        body: Any,
+    ) -> None:
+        """Keep the mapped body of a GET response that carries validators."""
+        etag = response.headers.get(aiohttp.hdrs.ETAG)
+        last_modified = response.headers.get(aiohttp.hdrs.LAST_MODIFIED)
+        if method == "get" and (etag or last_modified):
+            self._response_cache.set(
+                cache_key, _CachedResponse(etag, last_modified, body, response.links)
+            )
+        else:
+            self._response_cache.discard(cache_key)
+
+    async def _async_send(  # noqa: PLR0913
+        self,
+        *,
+        method: str,
+        url: str | URL,
+        data: dict | None,
+        headers: dict | None,
+        transform: Callable[[Any], Any] | None,
+        decode: Callable[[bytes], Any],
+    ) -> tuple[Any, MultiDictProxy] | None:
+        """Send one request attempt, returning None when Canvas throttled it."""
+        cache_key = (str(url), transform)
+        cached = self._response_cache.get(cache_key) if method == "get" else None
+        if cached is not None:
+            headers = dict(headers or {})
+            if cached.etag is not None:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified is not None:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        metrics = self.metrics.endpoint(url)
+        metrics.requests += 1
+        started = time.perf_counter()
+        answered = False
         try:
-            async with async_timeout.timeout(10):
+            remaining = _remaining_time()
+            timeout = (
+                REQUEST_TIMEOUT
+                if remaining is None
+                else min(REQUEST_TIMEOUT, remaining)
+            )
+            async with async_timeout.timeout(timeout):
                 response = await self._session.request(
                     method=method,
-                    url=f"{self._canvas_base_url}{path}",
+                    url=url,
                     headers=headers,
                     json=data,
                 )
+                self._rate_limiter.update(response.headers)
+                if await _async_is_throttled(response):
+                    LOGGER.debug("Canvas throttled request to %s", url)
+                    self._rate_limiter.throttled()
+                    return None
+
+                if cached is not None and response.status == HTTPStatus.NOT_MODIFIED:
+                    metrics.latency.record(time.perf_counter() - started)
+                    metrics.not_modified += 1
+                    answered = True
+                    return cached.body, cached.links
+
                 _verify_response_or_raise(response)
-                return await response.json()
+                raw = await response.read()
+                metrics.latency.record(time.perf_counter() - started)
+                metrics.response_bytes += len(raw)
+                body = _decode_body(raw, metrics, transform, decode)
+
+                self._cache_response(method, cache_key, response, body)
+                answered = True
+                return body, response.links
 
+        except CanvasLmsApiClientError:
+            raise
         except TimeoutError as exception:
+            _raise_if_past_deadline(url)
             msg = f"Timeout error fetching information - {exception}"
             raise CanvasLmsApiClientCommunicationError(
                 msg,
@@ -160,3 +1329,6 @@ class CanvasLmsApiClient:
             raise CanvasLmsApiClientError(
                 msg,
             ) from exception
+        finally:
+            if not answered:
+                metrics.errors += 1
@@ -0,0 +1,161 @@
+"""Calendar platform for canvas_lms_integration."""
+
+from __future__ import annotations
+
+import bisect
+import itertools
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.calendar import (
+    CalendarEntity,
+    CalendarEntityDescription,
+    CalendarEvent,
+)
+from homeassistant.core import callback
+from homeassistant.util import dt as dt_util
+
+from .const import Calendar
+from .entity import CanvasLmsEntity, fingerprint_items
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable
+
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+    from .data import CanvasLmsConfigEntry
+
+
+@dataclass
+class CanvasLmsCalendarEntityDescription(CalendarEntityDescription):
+    """Canvas LMS calendar entity description."""
+
+    entity_registry_enabled_default: bool = False
+    update_interval: timedelta = timedelta(hours=6)
+    fingerprint_fn: Callable[[Any], Hashable] | None = None
+
+
+ENTITY_DESCRIPTIONS = (
+    CanvasLmsCalendarEntityDescription(
+        key=Calendar,
+        name="Canvas LMS Calendar",
+        icon="mdi:calendar-school",
+        fingerprint_fn=fingerprint_items("uid", "start", "end", "summary"),
+    ),
+)
+
+
+def _timestamp(moment: date | datetime) -> float:
+    """Return the POSIX time of a moment, all-day dates at local midnight."""
+    if isinstance(moment, datetime):
+        return moment.timestamp()
+    return dt_util.start_of_local_day(moment).timestamp()
+
+
+def _calendar_event(event: dict[str, Any]) -> CalendarEvent:
+    """Build a calendar event from an event record."""
+    parse = date.fromisoformat if event["all_day"] else datetime.fromisoformat
+    return CalendarEvent(
+        start=parse(event["start"]),
+        end=parse(event["end"]),
+        summary=event.get("summary") or event["course"],
+        description=event.get("description"),
+        location=event.get("location"),
+        uid=event.get("uid"),
+    )
+
+
+class CanvasLmsEventIndex:
+    """
+    Calendar events sorted by start, queried by time range.
+
+    Alongside the start times the index keeps the running maximum of the end
+    times, which is sorted too, so the events overlapping a range are found
+    with two bisections and a scan of the candidates between them.
+    """
+
+    def __init__(self, events: list[CalendarEvent]) -> None:
+        """Build the index."""
+        self._events = sorted(events, key=lambda event: _timestamp(event.start))
+        self._starts = [_timestamp(event.start) for event in self._events]
+        self._ends = [_timestamp(event.end) for event in self._events]
+        self._max_ends = list(itertools.accumulate(self._ends, max))
+
+    def __len__(self) -> int:
+        """Return the number of events."""
+        return len(self._events)
+
+    def overlapping(self, start: datetime, end: datetime) -> list[CalendarEvent]:
+        """Return the events that overlap [start, end)."""
+        start_ts, end_ts = start.timestamp(), end.timestamp()
+        high = bisect.bisect_left(self._starts, end_ts)
+        low = bisect.bisect_right(self._max_ends, start_ts, hi=high)
+        return [
+            self._events[index]
+            for index in range(low, high)
+            if self._ends[index] > start_ts
+        ]
+
+    def next_event(self, now: datetime) -> CalendarEvent | None:
+        """Return the event in progress or the next one to start."""
+        now_ts = now.timestamp()
+        low = bisect.bisect_right(self._max_ends, now_ts)
+        for index in range(low, len(self._events)):
+            if self._ends[index] > now_ts:
+                return self._events[index]
+        return None
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,  # noqa: ARG001
+    entry: CanvasLmsConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the calendar platform."""
+    coordinator = entry.runtime_data
+    entities: list[CanvasLmsCalendar] = []
+    for observee_id in coordinator.observees:
+        for description in ENTITY_DESCRIPTIONS:
+            entity = CanvasLmsCalendar(coordinator, description, entry, observee_id)
+            coordinator.entities.append(entity)
+            entities.append(entity)
+
+    async_add_entities(entities)
+
+
+class CanvasLmsCalendar(CanvasLmsEntity, CalendarEntity):
+    """Course calendar events of one observee."""
+
+    _index = CanvasLmsEventIndex([])
+
+    async def async_added_to_hass(self) -> None:
+        """Index the events available when added."""
+        self._index = self._build_index()
+        await super().async_added_to_hass()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Index the events once per coordinator update."""
+        self._index = self._build_index()
+        super()._handle_coordinator_update()
+
+    def _build_index(self) -> CanvasLmsEventIndex:
+        """Index the events of the current coordinator data."""
+        events = self.observee_data.get(self.entity_description.key) or []
+        return CanvasLmsEventIndex([_calendar_event(event) for event in events])
+
+    @property
+    def event(self) -> CalendarEvent | None:
+        """Return the current or next upcoming event."""
+        return self._index.next_event(dt_util.utcnow())
+
+    async def async_get_events(
+        self,
+        hass: HomeAssistant,  # noqa: ARG002
+        start_date: datetime,
+        end_date: datetime,
+    ) -> list[CalendarEvent]:
+        """Return the events overlapping a time range."""
+        return self._index.overlapping(start_date, end_date)
@@ -2,15 +2,17 @@
 
 from __future__ import annotations
 
-import logging
-from typing import Any
+import asyncio
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
 
 import voluptuous as vol
-from canvasapi.exceptions import InvalidAccessToken
 from homeassistant import config_entries, data_entry_flow
-from homeassistant.const import CONF_ACCESS_TOKEN
+from homeassistant.components import webhook
+from homeassistant.const import CONF_ACCESS_TOKEN, CONF_WEBHOOK_ID
+from homeassistant.core import callback
 from homeassistant.helpers import selector
-from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .api import (
     CanvasLmsApiClient,
@@ -19,23 +21,76 @@ from .api import (
     CanvasLmsApiClientError,
 )
 from .const import (
+    CONF_ATTRIBUTES_MAX_BYTES,
     CONF_CANVAS_URL,
     # CONF_COURSES,
-    CONF_OBSERVEE,
+    CONF_DATA_KEYS,
+    CONF_INCLUDE_DESCRIPTIONS,
+    CONF_OBSERVEES,
+    CONF_PUSH,
+    CONF_TRANSPORT,
+    CONF_UPDATE_INTERVALS,
+    DATA_KEYS,
+    DEFAULT_ATTRIBUTES_MAX_BYTES,
+    DEFAULT_TRANSPORT,
     DOMAIN,
     LOGGER,
+    MIN_UPDATE_INTERVAL,
+    TRANSPORT_GRAPHQL,
+    TRANSPORT_REST,
 )
 
-_LOGGER = logging.getLogger(__name__)
+if TYPE_CHECKING:
+    from collections.abc import Mapping
 
-observees = {}
-usernames = []
+    from .data import CanvasLmsConfigEntry
+
+
+@dataclass(slots=True)
+class _Discovery:
+    """The user an access token belongs to and the students it observes."""
+
+    user: dict[str, Any]
+    observees: dict[str, str]
+
+
+async def _async_discover(client: CanvasLmsApiClient) -> _Discovery:
+    """
+    Validate an access token and list the students it observes.
+
+    Both requests are sent concurrently. The token's memoized requests are
+    forgotten first so they reach Canvas, and a revoked token or a changed
+    list of students is not answered from the memo.
+    """
+    client.forget_memoized()
+    user, observees = await asyncio.gather(
+        client.async_get_user("self"), client.async_get_observees("self")
+    )
+    return _Discovery(
+        user=user,
+        observees={
+            str(observee["id"]): observee["name"] for observee in observees or []
+        },
+    )
 
 
 class CanvasLmsFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
     """Config flow for Canvas LMS."""
 
-    VERSION = 1
+    VERSION = 2
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: CanvasLmsConfigEntry,
+    ) -> CanvasLmsOptionsFlowHandler:
+        """Return the options flow."""
+        return CanvasLmsOptionsFlowHandler(config_entry)
+
+    def __init__(self) -> None:
+        """Initialize the flow."""
+        self.data: dict[str, Any] = {}
+        self._discovery: _Discovery | None = None
 
     async def async_step_user(
         self,
@@ -44,22 +99,14 @@ class CanvasLmsFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         """Handle a flow initialized by the user."""
         _errors = {}
         if user_input is not None:
-            try:
-                await self._test_credentials(
+            if (
+                error := await self._async_validate(
                     canvas_url=user_input[CONF_CANVAS_URL],
                     password=user_input[CONF_ACCESS_TOKEN],
                 )
-            except CanvasLmsApiClientAuthenticationError as exception:
-                LOGGER.warning(exception)
-                _errors["base"] = "auth"
-            except CanvasLmsApiClientCommunicationError as exception:
-                LOGGER.error(exception)
-                _errors["base"] = "connection"
-            except CanvasLmsApiClientError as exception:
-                LOGGER.exception(exception)
-                _errors["base"] = "unknown"
+            ) is not None:
+                _errors["base"] = error
             else:
-                await self._retrieve_available_observees()
                 self.data = {
                     CONF_CANVAS_URL: user_input[CONF_CANVAS_URL],
                     CONF_ACCESS_TOKEN: user_input[CONF_ACCESS_TOKEN],
@@ -91,13 +138,17 @@ class CanvasLmsFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
     async def async_step_observees(
         self, user_input: dict[str, Any] | Any = None
     ) -> data_entry_flow.FlowResult:
-        """Something."""
+        """Let the user pick the students to follow."""
+        observees = self._discovery.observees if self._discovery else {}
         observee_schema = vol.Schema(
             {
-                vol.Required(CONF_OBSERVEE): selector.SelectSelector(
+                vol.Required(CONF_OBSERVEES): selector.SelectSelector(
                     selector.SelectSelectorConfig(
-                        options=usernames,
-                        multiple=False,
+                        options=[
+                            selector.SelectOptionDict(value=observee_id, label=name)
+                            for observee_id, name in observees.items()
+                        ],
+                        multiple=True,
                         mode=selector.SelectSelectorMode.DROPDOWN,
                     )
                 )
@@ -105,38 +156,221 @@ class CanvasLmsFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         )
 
         errors: dict[str, str] = {}
-        if user_input is not None:
-            observee = user_input.get(CONF_OBSERVEE)
-            # The value that is selected is already the id
-            self.data[CONF_OBSERVEE] = observee
+        if user_input is not None and not user_input.get(CONF_OBSERVEES):
+            errors[CONF_OBSERVEES] = "no_observees"
+        elif user_input is not None:
+            # The values that are selected are already the ids
+            self.data[CONF_OBSERVEES] = {
+                observee: observees[observee] for observee in user_input[CONF_OBSERVEES]
+            }
             return self.async_create_entry(
-                title=observees[int(observee)]["name"], data=self.data
+                title=", ".join(self.data[CONF_OBSERVEES].values()), data=self.data
             )
 
         return self.async_show_form(
             step_id="observees", data_schema=observee_schema, errors=errors
         )
 
-    async def _test_credentials(self, canvas_url: str, password: str) -> None:
-        """Validate credentials."""
+    async def async_step_reauth(
+        self,
+        entry_data: Mapping[str, Any],
+    ) -> data_entry_flow.FlowResult:
+        """Start reauthentication when Canvas rejects the access token."""
+        self.data = dict(entry_data)
+        return await self.async_step_reauth_confirm()
+
+    async def async_step_reauth_confirm(
+        self,
+        user_input: dict | None = None,
+    ) -> data_entry_flow.FlowResult:
+        """Ask for a new access token and update the entry with it."""
+        _errors = {}
+        entry = self.hass.config_entries.async_get_entry(self.context["entry_id"])
+        if user_input is not None and entry is not None:
+            if (
+                error := await self._async_validate(
+                    canvas_url=self.data[CONF_CANVAS_URL],
+                    password=user_input[CONF_ACCESS_TOKEN],
+                )
+            ) is not None:
+                _errors["base"] = error
+            else:
+                return self.async_update_reload_and_abort(
+                    entry,
+                    data={
+                        **entry.data,
+                        CONF_ACCESS_TOKEN: user_input[CONF_ACCESS_TOKEN],
+                    },
+                    reason="reauth_successful",
+                )
+
+        return self.async_show_form(
+            step_id="reauth_confirm",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_ACCESS_TOKEN): selector.TextSelector(
+                        selector.TextSelectorConfig(
+                            type=selector.TextSelectorType.PASSWORD,
+                        ),
+                    ),
+                },
+            ),
+            description_placeholders={
+                "name": entry.title if entry else "",
+                "canvas_url": self.data[CONF_CANVAS_URL],
+            },
+            errors=_errors,
+        )
+
+    async def _async_validate(self, canvas_url: str, password: str) -> str | None:
+        """Validate credentials and discover observees, returning any error."""
         client = CanvasLmsApiClient(
             canvas_base_url=canvas_url,
             api_key=password,
-            session=async_create_clientsession(self.hass),
+            session=async_get_clientsession(self.hass),
         )
-        self._canvas = client
-        await client.async_get_user("self")
-
-    async def _retrieve_available_observees(self) -> None:
         try:
-            _observees = await self._canvas.async_get_observees("self")
-            for observee in _observees:
-                observees[observee["id"]] = observee
-                usernames.append(
-                    {
-                        "value": str(observee["id"]),
-                        "label": observee["name"],
-                    }
+            self._discovery = await _async_discover(client)
+        except CanvasLmsApiClientAuthenticationError as exception:
+            LOGGER.warning(exception)
+            return "auth"
+        except CanvasLmsApiClientCommunicationError as exception:
+            LOGGER.error(exception)
+            return "connection"
+        except CanvasLmsApiClientError as exception:
+            LOGGER.exception(exception)
+            return "unknown"
+        return None
+
+
+def _interval_field(key: str) -> str:
+    """Return the options form field of a data key's poll interval."""
+    return f"{key}_interval"
+
+
+class CanvasLmsOptionsFlowHandler(config_entries.OptionsFlow):
+    """
+    Options flow for Canvas LMS.
+
+    The options are applied to the running coordinator, see
+    ``async_update_options``, so changing them does not reload the entry.
+    """
+
+    def __init__(self, config_entry: CanvasLmsConfigEntry) -> None:
+        """Initialize the options flow."""
+        self.config_entry = config_entry
+
+    async def async_step_init(
+        self,
+        user_input: dict[str, Any] | None = None,
+    ) -> data_entry_flow.FlowResult:
+        """Manage the options."""
+        _errors = {}
+        if user_input is not None:
+            if not user_input.get(CONF_OBSERVEES):
+                _errors[CONF_OBSERVEES] = "no_observees"
+            elif not user_input.get(CONF_DATA_KEYS):
+                _errors[CONF_DATA_KEYS] = "no_data_keys"
+            else:
+                return self.async_create_entry(title="", data=self._options(user_input))
+
+        options = user_input or self._form_values()
+        webhook_id = self.config_entry.data.get(CONF_WEBHOOK_ID)
+        return self.async_show_form(
+            step_id="init",
+            data_schema=self.add_suggested_values_to_schema(self._schema(), options),
+            description_placeholders={
+                "webhook_path": webhook.async_generate_path(webhook_id)
+                if webhook_id
+                else "-",
+            },
+            errors=_errors,
+        )
+
+    def _form_values(self) -> dict[str, Any]:
+        """Return the current options as form values."""
+        options = self.config_entry.options
+        values = {
+            CONF_OBSERVEES: options.get(
+                CONF_OBSERVEES, list(self.config_entry.data[CONF_OBSERVEES])
+            ),
+            CONF_DATA_KEYS: options.get(CONF_DATA_KEYS, list(DATA_KEYS)),
+            CONF_TRANSPORT: options.get(CONF_TRANSPORT, DEFAULT_TRANSPORT),
+            CONF_INCLUDE_DESCRIPTIONS: options.get(CONF_INCLUDE_DESCRIPTIONS, True),
+            CONF_PUSH: options.get(CONF_PUSH, False),
+            CONF_ATTRIBUTES_MAX_BYTES: options.get(
+                CONF_ATTRIBUTES_MAX_BYTES, DEFAULT_ATTRIBUTES_MAX_BYTES
+            ),
+        }
+        for key, minutes in options.get(CONF_UPDATE_INTERVALS, {}).items():
+            values[_interval_field(key)] = minutes
+        return values
+
+    @staticmethod
+    def _options(user_input: dict[str, Any]) -> dict[str, Any]:
+        """Return the options stored for the submitted form."""
+        options = {
+            key: value
+            for key, value in user_input.items()
+            if not key.endswith("_interval")
+        }
+        options[CONF_ATTRIBUTES_MAX_BYTES] = int(options[CONF_ATTRIBUTES_MAX_BYTES])
+        options[CONF_UPDATE_INTERVALS] = {
+            key: int(user_input[_interval_field(key)])
+            for key in DATA_KEYS
+            if user_input.get(_interval_field(key))
+        }
+        return options
+
+    def _schema(self) -> vol.Schema:
+        """Return the options form, with a poll interval per data key."""
+        schema: dict[Any, Any] = {
+            vol.Required(CONF_OBSERVEES): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=[
+                        selector.SelectOptionDict(value=observee_id, label=name)
+                        for observee_id, name in self.config_entry.data[
+                            CONF_OBSERVEES
+                        ].items()
+                    ],
+                    multiple=True,
+                    mode=selector.SelectSelectorMode.DROPDOWN,
+                )
+            ),
+            vol.Required(CONF_DATA_KEYS): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=list(DATA_KEYS),
+                    multiple=True,
+                    mode=selector.SelectSelectorMode.LIST,
+                    translation_key=CONF_DATA_KEYS,
+                )
+            ),
+            vol.Required(CONF_TRANSPORT): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=[TRANSPORT_REST, TRANSPORT_GRAPHQL],
+                    mode=selector.SelectSelectorMode.DROPDOWN,
+                    translation_key=CONF_TRANSPORT,
+                )
+            ),
+            vol.Required(CONF_INCLUDE_DESCRIPTIONS): selector.BooleanSelector(),
+            vol.Required(CONF_PUSH): selector.BooleanSelector(),
+            vol.Required(CONF_ATTRIBUTES_MAX_BYTES): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=1024,
+                    max=DEFAULT_ATTRIBUTES_MAX_BYTES,
+                    step=256,
+                    unit_of_measurement="B",
+                    mode=selector.NumberSelectorMode.BOX,
+                )
+            ),
+        }
+        for key in DATA_KEYS:
+            schema[vol.Optional(_interval_field(key))] = selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=MIN_UPDATE_INTERVAL.total_seconds() // 60,
+                    max=24 * 60,
+                    unit_of_measurement="min",
+                    mode=selector.NumberSelectorMode.BOX,
                 )
-        except InvalidAccessToken:
-            raise ValueError from InvalidAccessToken
+            )
+        return vol.Schema(schema)
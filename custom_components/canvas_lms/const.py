@@ -1,5 +1,6 @@
 """Constants for integration_blueprint."""
 
+from datetime import timedelta
 from logging import Logger, getLogger
 
 LOGGER: Logger = getLogger(__package__)
@@ -10,9 +11,104 @@ CONF_OBSERVEES = "observees"
 CONF_OBSERVEE = "observee"
 CONF_CANVAS_URL = "canvas_url"
 CONF_COURSES = "courses"
+CONF_CONFIG_ENTRY_ID = "config_entry_id"
+CONF_COURSE_ID = "course_id"
+CONF_TRANSPORT = "transport"
+CONF_PUSH = "push"
+CONF_DATA_KEYS = "data_keys"
+CONF_UPDATE_INTERVALS = "update_intervals"
+CONF_ATTRIBUTES_MAX_BYTES = "attributes_max_bytes"
+CONF_INCLUDE_DESCRIPTIONS = "include_descriptions"
 
 NAME = "Canvas LMS"
 VERSION = "0.0.1"
+# Each data key is refreshed on its own schedule (see the entity descriptions).
+# The coordinator wakes up for the earliest due key, but never more often than
+# MIN_UPDATE_INTERVAL, and retries failed keys sooner than their usual cadence.
+DEFAULT_UPDATE_INTERVAL = timedelta(hours=1)
+MIN_UPDATE_INTERVAL = timedelta(minutes=1)
+FAILED_KEY_RETRY_INTERVAL = timedelta(minutes=15)
+# REST fetches every data key of every observee separately. GraphQL reads
+# courses, grades and missing assignments of all observees in one query and
+# falls back to REST for a while when that query fails.
+TRANSPORT_REST = "rest"
+TRANSPORT_GRAPHQL = "graphql"
+DEFAULT_TRANSPORT = TRANSPORT_REST
+GRAPHQL_FALLBACK_INTERVAL = timedelta(hours=6)
+# Time budget of one refresh, shared by all its keys and pages. Keys that do
+# not finish in time keep their previous data and are marked partial.
+DEFAULT_REFRESH_BUDGET = timedelta(seconds=90)
+# In push mode Canvas events posted to the entry's webhook make the keys they
+# affect due. Events arriving within the cooldown share one refresh, and the
+# scheduled polls keep running as a safety net.
+PUSH_DEBOUNCE_COOLDOWN = timedelta(seconds=5)
+# Maximum number of data keys refreshed at once by the coordinator.
+DEFAULT_REFRESH_CONCURRENCY = 4
+# Snapshots of the last successful refresh that seed the coordinator on setup.
+SNAPSHOT_STORAGE_VERSION = 2
+SNAPSHOT_SAVE_DELAY = 30
+DEFAULT_SNAPSHOT_MAX_AGE = timedelta(hours=24)
+# Entity attributes are kept below the recorder's 16 KiB attribute limit, and
+# long text fields such as descriptions are cut first when they do not fit.
+# 1 KiB is left for the attributes Home Assistant adds, such as friendly_name,
+# attribution and icon.
+DEFAULT_ATTRIBUTES_MAX_BYTES = 15 * 1024
+ATTRIBUTE_TEXT_MAX_CHARS = 256
+# How long a syllabus is reused when Canvas does not report when the course
+# last changed.
+SYLLABUS_CACHE_TTL = timedelta(days=1)
+# Planner items are synced incrementally: each refresh fetches the days that
+# entered the horizon since the last sync plus the next few days, where
+# submissions change most. The whole horizon is fetched again once a day.
+PLANNER_HORIZON = timedelta(days=14)
+PLANNER_RECHECK_WINDOW = timedelta(days=2)
+PLANNER_FULL_SYNC_INTERVAL = timedelta(days=1)
+UPCOMING_ATTRIBUTE_ITEMS = 10
+# Missing-assignment counts are sampled when they change, and at least every
+# HISTORY_HEARTBEAT, into ring buffers of HISTORY_SAMPLES samples per series.
+# Trend sensors compare the counts over TREND_PERIOD.
+HISTORY_SAMPLES = 512
+HISTORY_HEARTBEAT = timedelta(hours=6)
+HISTORY_COURSE_RETENTION = timedelta(days=30)
+TREND_PERIOD = timedelta(days=7)
+# Announcements and conversations are synced from the newest time seen, and
+# at most FEED_CACHE_SIZE of each are kept per observee. The first sync of
+# announcements looks back ANNOUNCEMENT_LOOKBACK.
+FEED_CACHE_SIZE = 50
+FEED_ATTRIBUTE_ITEMS = 5
+ANNOUNCEMENT_LOOKBACK = timedelta(days=14)
+# Maximum number of course calendar feeds downloaded at once per observee.
+CALENDAR_FEED_CONCURRENCY = 4
 # Sensors
 MissingAssignments = "missing_assignments"
 Courses = "courses"
+Grades = "grades"
+UpcomingAssignments = "upcoming_assignments"
+Announcements = "announcements"
+Conversations = "conversations"
+# Calendars
+Calendar = "calendar"
+# Observee data keys that can be enabled in the options, all by default.
+DATA_KEYS = (
+    MissingAssignments,
+    Courses,
+    Grades,
+    UpcomingAssignments,
+    Announcements,
+    Conversations,
+    Calendar,
+)
+# Trend sensors
+MissingAssignmentsChange = "missing_assignments_change"
+MissingAssignmentsRate = "missing_assignments_rate"
+MissingAssignmentsByCourse = "missing_assignments_by_course"
+# Diagnostic sensors
+Requests = "requests"
+ResponseBytes = "response_bytes"
+RefreshDuration = "refresh_duration"
+# Services
+SERVICE_GET_SYLLABUS = "get_syllabus"
+# Events
+EVENT_MISSING_ASSIGNMENTS_CHANGED = f"{DOMAIN}_missing_assignments_changed"
+EVENT_NEW_ANNOUNCEMENT = f"{DOMAIN}_new_announcement"
+EVENT_NEW_CONVERSATION_MESSAGE = f"{DOMAIN}_new_conversation_message"
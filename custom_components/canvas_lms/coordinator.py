@@ -2,25 +2,103 @@
 
 from __future__ import annotations
 
+import asyncio
+import time
 from datetime import timedelta
 from typing import TYPE_CHECKING, Any
 
+from homeassistant.core import callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
 from .api import (
+    GRAPHQL_KEYS,
     CanvasLmsApiClient,
     CanvasLmsApiClientAuthenticationError,
+    CanvasLmsApiClientDeadlineError,
     CanvasLmsApiClientError,
+    request_deadline,
+)
+from .const import (
+    CONF_ATTRIBUTES_MAX_BYTES,
+    CONF_DATA_KEYS,
+    CONF_INCLUDE_DESCRIPTIONS,
+    CONF_OBSERVEES,
+    CONF_TRANSPORT,
+    CONF_UPDATE_INTERVALS,
+    DATA_KEYS,
+    DEFAULT_ATTRIBUTES_MAX_BYTES,
+    DEFAULT_REFRESH_BUDGET,
+    DEFAULT_REFRESH_CONCURRENCY,
+    DEFAULT_SNAPSHOT_MAX_AGE,
+    DEFAULT_TRANSPORT,
+    DEFAULT_UPDATE_INTERVAL,
+    DOMAIN,
+    EVENT_MISSING_ASSIGNMENTS_CHANGED,
+    FAILED_KEY_RETRY_INTERVAL,
+    GRAPHQL_FALLBACK_INTERVAL,
+    LOGGER,
+    MIN_UPDATE_INTERVAL,
+    PUSH_DEBOUNCE_COOLDOWN,
+    TRANSPORT_GRAPHQL,
+    Courses,
+    MissingAssignments,
 )
-from .const import CONF_OBSERVEE, DOMAIN, LOGGER
 from .data import CanvasLmsData
+from .history import MissingAssignmentHistory
+from .metrics import LatencyHistogram
+from .store import CanvasLmsSnapshotStore
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable, Iterable, Mapping
+    from datetime import datetime
+
     from homeassistant.core import HomeAssistant
-    from homeassistant.helpers.entity import Entity
+    from homeassistant.helpers.entity import EntityDescription
 
     from .data import CanvasLmsConfigEntry
+    from .entity import CanvasLmsEntity
+
+# A data key of one observee, e.g. ("1234", "missing_assignments").
+type DataSlot = tuple[str, str]
+
+
+def _merge_data(
+    descriptions: dict[DataSlot, EntityDescription],
+    previous: dict[str, dict[str, Any]],
+    refreshed: dict[DataSlot, Any],
+    partial: dict[DataSlot, Any],
+) -> dict[str, dict[str, Any]]:
+    """
+    Combine the refreshed data with the previous data of every enabled key.
+
+    Partial keys keep their previous value when there is one, since it is
+    complete, and otherwise use whatever was fetched before the deadline.
+    Keys without a description, such as restored keys whose entities are
+    not added yet, keep their previous value.
+    """
+    data: dict[str, dict[str, Any]] = {
+        observee_id: {
+            key: value
+            for key, value in observee_data.items()
+            if (observee_id, key) not in descriptions
+        }
+        for observee_id, observee_data in previous.items()
+    }
+    for slot in descriptions:
+        observee_id, key = slot
+        if slot in refreshed:
+            value = refreshed[slot]
+        elif key in previous.get(observee_id, {}):
+            value = previous[observee_id][key]
+        elif partial.get(slot) is not None:
+            value = partial[slot]
+        else:
+            continue
+        data.setdefault(observee_id, {})[key] = value
+    return data
 
 
 # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
@@ -33,38 +111,518 @@ class CanvasLmsDataUpdateCoordinator(DataUpdateCoordinator):
         self,
         hass: HomeAssistant,
         client: CanvasLmsApiClient,
+        refresh_concurrency: int = DEFAULT_REFRESH_CONCURRENCY,
+        snapshot_max_age: timedelta = DEFAULT_SNAPSHOT_MAX_AGE,
     ) -> None:
         """Initialize."""
         super().__init__(
             hass=hass,
             logger=LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(hours=1),
+            update_interval=DEFAULT_UPDATE_INTERVAL,
         )
 
-        observee_id = self.config_entry.data[CONF_OBSERVEE]
-        LOGGER.info(f"registering {observee_id}")
-        self.api = CanvasLmsData(hass, client, observee_id)
+        self.client = client
+        self.observees = {
+            observee_id: CanvasLmsData(
+                hass, client, observee_id, entry_id=self.config_entry.entry_id
+            )
+            for observee_id in self.config_entry.data[CONF_OBSERVEES]
+        }
+        LOGGER.info(f"registering {', '.join(self.observees)}")
         self.available_entities: list[str] = []
-        self.entities: list[Entity] = []
+        self.entities: list[CanvasLmsEntity] = []
+        self.refresh_concurrency = refresh_concurrency
+        self.snapshot_max_age = snapshot_max_age
+        self.snapshot_store = CanvasLmsSnapshotStore(hass, self.config_entry.entry_id)
+        self.stale = False
+        self._next_refresh: dict[DataSlot, datetime] = {}
+        self.refresh_latency = LatencyHistogram()
+        self.last_refresh_seconds: float | None = None
+        self._fingerprints: dict[DataSlot, Hashable] = {}
+        self._changed_slots: set[DataSlot] | None = None
+        self._graphql_fallback_until: datetime | None = None
+        self.refresh_budget = DEFAULT_REFRESH_BUDGET
+        self.partial: set[DataSlot] = set()
+        self._pushed: set[DataSlot] = set()
+        self._push_debouncer = Debouncer(
+            hass,
+            LOGGER,
+            cooldown=PUSH_DEBOUNCE_COOLDOWN.total_seconds(),
+            immediate=False,
+            function=self._async_push_refresh,
+        )
+        self.unregister_webhook: Callable[[], None] | None = None
+        self.transport = DEFAULT_TRANSPORT
+        self.attributes_max_bytes = DEFAULT_ATTRIBUTES_MAX_BYTES
+        self.enabled_observees = set(self.observees)
+        self.enabled_keys = set(DATA_KEYS)
+        self.update_intervals: dict[str, timedelta] = {}
+        self.history: dict[str, MissingAssignmentHistory] = {}
+        self.options: dict[str, Any] = {}
+        self.async_apply_options(self.config_entry.options)
 
-    async def _async_update_data(self) -> Any:
-        """Update data via library."""
-        data: dict[str, Any] = {}
+    def is_enabled(self, observee_id: str, key: str) -> bool:
+        """Return whether a data key of an observee is enabled in the options."""
+        return observee_id in self.enabled_observees and key in self.enabled_keys
+
+    @callback
+    def async_apply_options(self, options: Mapping[str, Any]) -> None:
+        """
+        Apply the entry options to the running coordinator.
+
+        Only the data keys the options change become due: keys of observees
+        or data keys that were just enabled, and the missing assignments when
+        descriptions are toggled. Keys whose interval changed are rescheduled
+        no later than the new interval. The data, caches and client are kept.
+        """
+        self.options = dict(options)
+        self.enabled_observees = set(
+            options.get(CONF_OBSERVEES) or self.observees
+        ).intersection(self.observees)
+        self.enabled_keys = set(options.get(CONF_DATA_KEYS, DATA_KEYS))
+        # Options saved before the default left headroom may be above it.
+        self.attributes_max_bytes = min(
+            options.get(CONF_ATTRIBUTES_MAX_BYTES, DEFAULT_ATTRIBUTES_MAX_BYTES),
+            DEFAULT_ATTRIBUTES_MAX_BYTES,
+        )
+        if (transport := options.get(CONF_TRANSPORT, DEFAULT_TRANSPORT)) != (
+            self.transport
+        ):
+            self.transport = transport
+            self._graphql_fallback_until = None
+
+        include_descriptions = options.get(CONF_INCLUDE_DESCRIPTIONS, True)
+        for data in self.observees.values():
+            if data.include_descriptions != include_descriptions:
+                data.include_descriptions = include_descriptions
+                self.async_mark_due([MissingAssignments], [data.observee_id])
+                # The refetched data must reach the entities whatever its
+                # fingerprint.
+                self._fingerprints.pop((data.observee_id, MissingAssignments), None)
+
+        update_intervals = {
+            key: timedelta(minutes=minutes)
+            for key, minutes in options.get(CONF_UPDATE_INTERVALS, {}).items()
+        }
+        now = dt_util.utcnow()
+        for slot, due in list(self._next_refresh.items()):
+            interval = update_intervals.get(slot[1])
+            if interval is not None and interval != self.update_intervals.get(slot[1]):
+                self._next_refresh[slot] = min(due, now + interval)
+        self.update_intervals = update_intervals
+
+        # Disabled keys drop out of the schedule, so they are due once enabled.
+        for slot in list(self._next_refresh):
+            if not self.is_enabled(*slot):
+                del self._next_refresh[slot]
+
+    @property
+    def next_refresh(self) -> dict[str, datetime]:
+        """Return when each scheduled observee data key is due next."""
+        return {
+            f"{observee_id}/{key}": due
+            for (observee_id, key), due in self._next_refresh.items()
+        }
+
+    async def async_restore_snapshot(self) -> bool:
+        """
+        Seed the coordinator with the last persisted data.
+
+        Returns whether a snapshot was restored. Data from a snapshot older
+        than ``snapshot_max_age`` is marked stale until a live refresh
+        succeeds.
+        """
+        snapshot = await self.snapshot_store.async_load()
+        if snapshot is None:
+            return False
+
+        self.stale = dt_util.utcnow() - snapshot.saved_at > self.snapshot_max_age
+        LOGGER.debug(
+            "Restored snapshot from %s (stale: %s)", snapshot.saved_at, self.stale
+        )
+        for observee_id, observee_data in snapshot.data.items():
+            if (data := self.observees.get(observee_id)) is not None:
+                data.restore(observee_data)
+        self.history = {
+            observee_id: MissingAssignmentHistory.from_dict(history)
+            for observee_id, history in snapshot.history.items()
+            if observee_id in self.observees
+        }
+        self.async_set_updated_data(snapshot.data)
+        return True
+
+    @callback
+    def async_mark_due(
+        self,
+        keys: Iterable[str] | None = None,
+        observee_ids: Iterable[str] | None = None,
+    ) -> None:
+        """Make data keys due at the next refresh, all of them by default."""
+        keys = None if keys is None else set(keys)
+        observee_ids = None if observee_ids is None else set(observee_ids)
+        for observee_id, key in list(self._next_refresh):
+            if (keys is None or key in keys) and (
+                observee_ids is None or observee_id in observee_ids
+            ):
+                del self._next_refresh[(observee_id, key)]
+
+    async def async_request_full_refresh(self) -> None:
+        """
+        Refresh every data key, as asked by the user.
+
+        Scheduled refreshes only fetch the keys that are due, an explicit
+        ``homeassistant.update_entity`` fetches them all, bypassing the
+        memoized requests. ``async_request_refresh``, which Home Assistant
+        also calls internally, keeps refreshing the due keys only.
+        """
+        self.async_mark_due()
+        self.client.forget_memoized()
+        await self.async_request_refresh()
+
+    async def async_shutdown(self) -> None:
+        """Cancel the pending push refresh along with the scheduled ones."""
+        await self._push_debouncer.async_shutdown()
+        await super().async_shutdown()
+
+    async def async_request_push_refresh(self, slots: Iterable[DataSlot]) -> None:
+        """
+        Refresh the given observee data keys soon, in response to a push.
+
+        Pushes arriving within ``PUSH_DEBOUNCE_COOLDOWN`` are coalesced into
+        one refresh of the keys they affect.
+        """
+        self._pushed.update(slots)
+        await self._push_debouncer.async_call()
+
+    async def _async_push_refresh(self) -> None:
+        """Refresh the pushed keys, bypassing the memoized requests."""
+        slots, self._pushed = self._pushed, set()
+        for slot in slots:
+            self._next_refresh.pop(slot, None)
+        LOGGER.debug("Refreshing %s after a push", sorted(slots))
+        self.client.forget_memoized()
+        await self.async_refresh()
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """
+        Notify the listeners of the data keys that changed.
+
+        After a refresh that changed only some keys, the entities of the
+        unchanged keys are skipped so they do not write identical states.
+        Every other update, such as a failure, a recovery or restored data,
+        notifies all listeners.
+        """
+        changed, self._changed_slots = self._changed_slots, None
+        if changed is None or not self.last_update_success:
+            super().async_update_listeners()
+            return
+        for update_callback, context in list(self._listeners.values()):
+            if context is None or context in changed:
+                update_callback()
+
+    def _track_changes(
+        self,
+        descriptions: dict[DataSlot, EntityDescription],
+        refreshed: dict[DataSlot, Any],
+        partial: set[DataSlot],
+    ) -> None:
+        """
+        Remember which slots changed for the next notification.
+
+        A refreshed slot changed when its description has no ``fingerprint_fn``
+        or the fingerprint differs from the previous refresh. Slots that became
+        partial or complete changed too. While the data is stale or after a
+        failed refresh every entity needs a write, so nothing is skipped.
+        """
+        changed = self.partial ^ partial
+        self.partial = partial
+        for slot, value in refreshed.items():
+            fingerprint_fn = getattr(descriptions[slot], "fingerprint_fn", None)
+            fingerprint = None if fingerprint_fn is None else fingerprint_fn(value)
+            if fingerprint is None or self._fingerprints.get(slot) != fingerprint:
+                changed.add(slot)
+            self._fingerprints[slot] = fingerprint
+        if not self.stale and self.last_update_success:
+            self._changed_slots = changed
+
+    @callback
+    def _async_record_missing_assignments(
+        self,
+        previous: dict[str, dict[str, Any]],
+        data: dict[str, dict[str, Any]],
+        refreshed: Iterable[DataSlot],
+    ) -> None:
+        """
+        Record the missing-assignment counts and fire an event on changes.
+
+        The event lists the missing assignments added and removed. The first
+        refresh has nothing to compare with, so it records the counts only.
+        """
+
+        def _summary(assignment: dict[str, Any]) -> dict[str, Any]:
+            return {
+                key: value for key, value in assignment.items() if key != "description"
+            }
+
+        now = dt_util.utcnow()
+        for observee_id, key in refreshed:
+            if key != MissingAssignments:
+                continue
+            compared = key in previous.get(observee_id, {})
+            before = (
+                {item["id"]: item for item in previous[observee_id][key]}
+                if compared
+                else {}
+            )
+            after = {item["id"]: item for item in data[observee_id][key]}
+            added = len(after.keys() - before.keys()) if compared else 0
+            self.history.setdefault(observee_id, MissingAssignmentHistory()).record(
+                now, data[observee_id][key], added
+            )
+            if not compared or before.keys() == after.keys():
+                continue
+            self.hass.bus.async_fire(
+                EVENT_MISSING_ASSIGNMENTS_CHANGED,
+                {
+                    "config_entry_id": self.config_entry.entry_id,
+                    "observee_id": observee_id,
+                    "added": [
+                        _summary(item)
+                        for item_id, item in after.items()
+                        if item_id not in before
+                    ],
+                    "removed": [
+                        _summary(item)
+                        for item_id, item in before.items()
+                        if item_id not in after
+                    ],
+                },
+            )
+
+    def _enabled_descriptions(self) -> dict[DataSlot, EntityDescription]:
+        """
+        Return the entity description of every enabled observee data key.
+
+        When several entities read a key, the first one added describes it.
+        """
+        descriptions: dict[DataSlot, EntityDescription] = {}
         for entity in self.entities:
+            if entity.observee_id is None or not self.is_enabled(
+                entity.observee_id, entity.data_key
+            ):
+                continue
             if not entity.enabled:
                 LOGGER.debug("Entity %s is disabled.", entity.entity_id)
                 continue
+            descriptions.setdefault(
+                (entity.observee_id, entity.data_key), entity.entity_description
+            )
+        return descriptions
+
+    def _schedule(
+        self,
+        descriptions: dict[DataSlot, EntityDescription],
+        refreshed: dict[DataSlot, Any],
+        failed: Iterable[DataSlot],
+    ) -> None:
+        """
+        Plan the next refresh of each key and wake up for the earliest one.
+
+        Every entity description declares its own ``update_interval`` and may
+        shorten or stretch it from the latest data with ``update_interval_fn``.
+        An interval set in the options replaces both. Failed keys are retried
+        after at most ``FAILED_KEY_RETRY_INTERVAL``.
+        """
+        now = dt_util.utcnow()
+        for slot, value in refreshed.items():
+            description = descriptions[slot]
+            interval = getattr(description, "update_interval", DEFAULT_UPDATE_INTERVAL)
+            if (interval_fn := getattr(description, "update_interval_fn", None)) and (
+                adaptive := interval_fn(value)
+            ):
+                interval = adaptive
+            self._next_refresh[slot] = now + self.update_intervals.get(
+                slot[1], interval
+            )
+        for slot in failed:
+            interval = self.update_intervals.get(
+                slot[1],
+                getattr(descriptions[slot], "update_interval", DEFAULT_UPDATE_INTERVAL),
+            )
+            self._next_refresh[slot] = now + min(interval, FAILED_KEY_RETRY_INTERVAL)
+
+        next_refresh = [self._next_refresh.get(slot, now) for slot in descriptions]
+        if next_refresh:
+            self.update_interval = max(min(next_refresh) - now, MIN_UPDATE_INTERVAL)
+
+    async def _async_update_data(self) -> Any:
+        """Update data via library, timing the whole refresh."""
+        started = time.perf_counter()
+        try:
+            return await self._async_update_keys()
+        finally:
+            self.last_refresh_seconds = time.perf_counter() - started
+            self.refresh_latency.record(self.last_refresh_seconds)
+
+    async def _async_fetch(
+        self, slots: list[DataSlot]
+    ) -> dict[DataSlot, Any | BaseException]:
+        """
+        Fetch the given slots, returning each slot's data or exception.
+
+        With the GraphQL transport the slots it covers are read in one batch
+        first. REST fetches the rest, for every observee concurrently and at
+        most ``refresh_concurrency`` at a time.
+        """
+        results: dict[DataSlot, Any | BaseException] = {}
+        if self.transport == TRANSPORT_GRAPHQL:
+            results.update(await self._async_fetch_batch(slots))
+        slots = [slot for slot in slots if slot not in results]
+
+        semaphore = asyncio.Semaphore(self.refresh_concurrency)
+
+        async def _async_update_slot(slot: DataSlot) -> Any:
+            observee_id, key = slot
+            async with semaphore:
+                return await self.observees[observee_id].async_update(key)
+
+        gathered = await asyncio.gather(
+            *(_async_update_slot(slot) for slot in slots), return_exceptions=True
+        )
+        results.update(zip(slots, gathered, strict=True))
+        return results
+
+    async def _async_fetch_batch(
+        self, slots: list[DataSlot]
+    ) -> dict[DataSlot, Any | BaseException]:
+        """
+        Fetch the slots the GraphQL transport covers in one request.
+
+        When the query fails for another reason than authentication nothing
+        is returned, so the slots are fetched over REST, and REST stays in use
+        for ``GRAPHQL_FALLBACK_INTERVAL``.
+        """
+        now = dt_util.utcnow()
+        if self._graphql_fallback_until is not None:
+            if now < self._graphql_fallback_until:
+                return {}
+            self._graphql_fallback_until = None
+
+        slots = [slot for slot in slots if slot[1] in GRAPHQL_KEYS]
+        if not slots:
+            return {}
+        observee_ids = sorted({observee_id for observee_id, _ in slots})
+        try:
+            batch = await self.client.async_get_batch(
+                observee_ids,
+                include_description=any(
+                    self.observees[observee_id].include_descriptions
+                    for observee_id in observee_ids
+                ),
+            )
+        except (
+            CanvasLmsApiClientAuthenticationError,
+            CanvasLmsApiClientDeadlineError,
+        ) as exception:
+            return dict.fromkeys(slots, exception)
+        except CanvasLmsApiClientError as exception:
+            LOGGER.warning(
+                "Canvas GraphQL refresh failed, using REST for %s: %s",
+                GRAPHQL_FALLBACK_INTERVAL,
+                exception,
+            )
+            self._graphql_fallback_until = now + GRAPHQL_FALLBACK_INTERVAL
+            return {}
+        return {
+            (observee_id, key): batch[observee_id][key] for observee_id, key in slots
+        }
+
+    async def _async_update_keys(self) -> dict[str, dict[str, Any]]:
+        """
+        Refresh the observee data keys that are due.
+
+        The result maps each observee id to its data keys. Only enabled keys
+        that are due (see ``_schedule``) are fetched (see ``_async_fetch``),
+        so all observees share one request budget. The other keys keep their
+        previous value. When some keys fail but others succeed the failed keys
+        keep their previous value too, so one broken endpoint does not discard
+        the rest of the refresh.
+
+        All requests share a deadline ``refresh_budget`` away. Keys still
+        fetching when it passes are marked partial and keep their previous
+        value, or the pages fetched in time when there is none, instead of
+        failing the refresh.
+
+        Keys about courses take them from the previous refresh rather than
+        requesting them again, see ``CanvasLmsData.courses``.
+
+        Only the entities of keys whose fingerprint changed are notified, and
+        changes to the missing assignments are fired as an event.
+        """
+        descriptions = self._enabled_descriptions()
+        now = dt_util.utcnow()
+        slots = [
+            slot for slot in descriptions if self._next_refresh.get(slot, now) <= now
+        ]
+        previous: dict[str, dict[str, Any]] = self.data or {}
+        for observee_id, observee in self.observees.items():
+            slot = (observee_id, Courses)
+            observee.courses = (
+                (previous.get(observee_id) or {}).get(Courses)
+                if slot in descriptions and slot not in self.partial
+                else None
+            )
+
+        with request_deadline(self.refresh_budget.total_seconds()):
+            results = await self._async_fetch(slots)
+
+        refreshed: dict[DataSlot, Any] = {}
+        partial: dict[DataSlot, Any] = {}
+        errors: dict[DataSlot, Exception] = {}
+        for slot, result in results.items():
+            if isinstance(result, CanvasLmsApiClientAuthenticationError):
+                raise ConfigEntryAuthFailed(result) from result
+            if isinstance(result, CanvasLmsApiClientDeadlineError):
+                partial[slot] = result.partial
+            elif isinstance(result, Exception):
+                errors[slot] = result
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                refreshed[slot] = result
+
+        self._schedule(descriptions, refreshed, [*errors, *partial])
+        if errors and not refreshed and not partial:
+            exception = next(iter(errors.values()))
+            raise UpdateFailed(exception) from exception
 
-            try:
-                data[entity.entity_description.key] = await self.api.async_update(
-                    entity.entity_description.key
-                )
-            except CanvasLmsApiClientAuthenticationError as exception:
-                raise ConfigEntryAuthFailed(exception) from exception
-            except CanvasLmsApiClientError as exception:
-                raise UpdateFailed(exception) from exception
-            except Exception as exception:
-                raise UpdateFailed(exception) from exception
+        for (observee_id, key), exception in errors.items():
+            LOGGER.warning(
+                "Error refreshing %s for %s, keeping previous data: %s",
+                key,
+                observee_id,
+                exception,
+            )
+        for observee_id, key in partial:
+            LOGGER.warning(
+                "Refreshing %s for %s took longer than %s, keeping partial data",
+                key,
+                observee_id,
+                self.refresh_budget,
+            )
 
+        data = _merge_data(descriptions, previous, refreshed, partial)
+        self._async_record_missing_assignments(previous, data, refreshed)
+        self._track_changes(descriptions, refreshed, set(partial))
+        if refreshed:
+            self.stale = False
+            await self.snapshot_store.async_save(
+                data,
+                {
+                    observee_id: history.as_dict()
+                    for observee_id, history in self.history.items()
+                },
+            )
         return data
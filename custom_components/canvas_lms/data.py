@@ -2,38 +2,104 @@
 
 from __future__ import annotations
 
+import asyncio
+from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
+from homeassistant.util import dt as dt_util
+
+from .api import CanvasLmsApiClientDeadlineError
 from .const import (
+    ANNOUNCEMENT_LOOKBACK,
+    CALENDAR_FEED_CONCURRENCY,
+    EVENT_NEW_ANNOUNCEMENT,
+    EVENT_NEW_CONVERSATION_MESSAGE,
+    FEED_CACHE_SIZE,
     LOGGER,
+    PLANNER_FULL_SYNC_INTERVAL,
+    PLANNER_HORIZON,
+    PLANNER_RECHECK_WINDOW,
+    SYLLABUS_CACHE_TTL,
+    Announcements,
+    Calendar,
+    Conversations,
     Courses,
+    Grades,
     MissingAssignments,
+    UpcomingAssignments,
 )
+from .feed import CanvasLmsFeed
+from .planner import CanvasLmsPlannerIndex
 
 if TYPE_CHECKING:
+    from datetime import datetime
+
     from homeassistant.config_entries import ConfigEntry
     from homeassistant.core import HomeAssistant
 
-    from .const import CanvasLmsApiClient
+    from .api import CanvasLmsApiClient
+    from .coordinator import CanvasLmsDataUpdateCoordinator
+
+type CanvasLmsConfigEntry = ConfigEntry[CanvasLmsDataUpdateCoordinator]
+
 
-type CanvasLmsConfigEntry = ConfigEntry[CanvasLmsData]
+@dataclass(slots=True)
+class _CachedSyllabus:
+    """A course syllabus and the course revision it was fetched for."""
+
+    updated_at: str | None
+    fetched_at: datetime
+    syllabus: str | None
 
 
 class CanvasLmsData:
     """Data for the CanvasLms integration."""
 
     def __init__(
-        self, hass: HomeAssistant, client: CanvasLmsApiClient, observee_id: str
+        self,
+        hass: HomeAssistant,
+        client: CanvasLmsApiClient,
+        observee_id: str,
+        *,
+        include_descriptions: bool = True,
+        entry_id: str | None = None,
     ) -> None:
         """Initialize Canvas LMS Data."""
         LOGGER.debug(f"CanvasLmsData init with {observee_id}")
         self.hass = hass
         self.client = client
         self.observee_id = observee_id
+        self.include_descriptions = include_descriptions
+        self.entry_id = entry_id
         self.entity_update_method = {
             Courses: self.async_update_classes,
             MissingAssignments: self.async_update_missing_assignments,
+            Grades: self.async_update_grades,
+            UpcomingAssignments: self.async_update_upcoming_assignments,
+            Announcements: self.async_update_announcements,
+            Conversations: self.async_update_conversations,
+            Calendar: self.async_update_calendar,
         }
+        # The observee's courses as last refreshed by the coordinator, which
+        # the other keys take their course ids and context codes from.
+        self.courses: list[dict[str, Any]] | None = None
+        self._syllabi: dict[int, _CachedSyllabus] = {}
+        self._planner = CanvasLmsPlannerIndex()
+        self._announcements = CanvasLmsFeed("posted_at", FEED_CACHE_SIZE)
+        self._conversations = CanvasLmsFeed("last_message_at", FEED_CACHE_SIZE)
+
+    def restore(self, data: dict[str, Any]) -> None:
+        """Resume incremental syncs from restored coordinator data."""
+        if (planner := data.get(UpcomingAssignments)) is not None:
+            self._planner = CanvasLmsPlannerIndex.from_dict(planner)
+        if (announcements := data.get(Announcements)) is not None:
+            self._announcements = CanvasLmsFeed.from_dict(
+                "posted_at", FEED_CACHE_SIZE, announcements
+            )
+        if (conversations := data.get(Conversations)) is not None:
+            self._conversations = CanvasLmsFeed.from_dict(
+                "last_message_at", FEED_CACHE_SIZE, conversations
+            )
 
     async def async_update(self, entity_key: str) -> Any:
         """Update the data."""
@@ -42,12 +108,234 @@ class CanvasLmsData:
 
         return None
 
+    async def _async_get_courses(self) -> list[dict[str, Any]]:
+        """
+        Return the observee's courses for the other keys.
+
+        The coordinator's courses are used when it has them, the courses are
+        only requested before the first refresh or while they are disabled.
+        """
+        if self.courses is not None:
+            return self.courses
+        return await self.client.async_get_courses(self.observee_id)
+
     async def async_update_missing_assignments(self) -> Any:
         """Update obervees classes."""
         LOGGER.debug(f"Retrieving missing assignments for {self.observee_id}")
-        return await self.client.async_get_missing_assignments(self.observee_id)
+        return await self.client.async_get_missing_assignments(
+            self.observee_id, include_description=self.include_descriptions
+        )
 
     async def async_update_classes(self) -> Any:
         """Update obervees classes."""
         LOGGER.debug(f"Retrieving courses for {self.observee_id}")
         return await self.client.async_get_courses(self.observee_id)
+
+    async def async_update_grades(self) -> Any:
+        """Update obervees grades."""
+        LOGGER.debug(f"Retrieving grades for {self.observee_id}")
+        return await self.client.async_get_grades(self.observee_id)
+
+    async def async_update_upcoming_assignments(self) -> Any:
+        """
+        Sync obervees planner items incrementally.
+
+        Only the days that entered ``PLANNER_HORIZON`` since the last sync and
+        the next ``PLANNER_RECHECK_WINDOW`` are fetched, and merged into the
+        index sorted by due date. The whole horizon is fetched again after
+        ``PLANNER_FULL_SYNC_INTERVAL``.
+        """
+        now = dt_util.utcnow()
+        today = dt_util.start_of_local_day()
+        horizon = today + PLANNER_HORIZON
+        planner = self._planner
+        planner.prune(today)
+
+        full_sync = (
+            planner.synced_until is None
+            or planner.synced_at is None
+            or planner.synced_until <= today
+            or now - planner.synced_at >= PLANNER_FULL_SYNC_INTERVAL
+        )
+        if full_sync:
+            windows = [(today, horizon)]
+        else:
+            windows = [
+                (today, min(planner.synced_until, today + PLANNER_RECHECK_WINDOW))
+            ]
+            if planner.synced_until < horizon:
+                windows.append((planner.synced_until, horizon))
+
+        changed = 0
+        try:
+            courses = await self._async_get_courses()
+            course_ids = [course["id"] for course in courses]
+            for start, end in windows:
+                LOGGER.debug(
+                    "Retrieving planner items for %s from %s to %s",
+                    self.observee_id,
+                    start,
+                    end,
+                )
+                items = await self.client.async_get_planner_items(
+                    self.observee_id, course_ids, start, end
+                )
+                changed += planner.merge_window(start, end, items)
+        except CanvasLmsApiClientDeadlineError as exception:
+            # The windows merged so far are complete, the cursor is not moved.
+            exception.partial = planner.as_dict()
+            raise
+
+        planner.synced_until = horizon
+        if full_sync:
+            planner.synced_at = now
+        LOGGER.debug(
+            "Synced planner of %s, %d of %d items changed",
+            self.observee_id,
+            changed,
+            len(planner.items),
+        )
+        return planner.as_dict()
+
+    def _merge_feed(
+        self,
+        feed: CanvasLmsFeed,
+        items: list[dict[str, Any]],
+        event_type: str,
+        started_at: datetime,
+    ) -> dict[str, Any]:
+        """
+        Merge synced items into a feed, firing an event for each new one.
+
+        The first sync only seeds the feed, so setting up the integration
+        does not announce every item Canvas already had.
+        """
+        seeded = feed.since is not None
+        new = feed.merge(
+            items, dt_util.as_utc(started_at).isoformat(timespec="seconds")
+        )
+        for item in new:
+            if seeded:
+                self.hass.bus.async_fire(
+                    event_type,
+                    {
+                        "config_entry_id": self.entry_id,
+                        "observee_id": self.observee_id,
+                        **item,
+                    },
+                )
+        return feed.as_dict()
+
+    async def async_update_announcements(self) -> Any:
+        """
+        Sync obervees course announcements posted since the newest one seen.
+
+        The first sync looks back ``ANNOUNCEMENT_LOOKBACK``.
+        """
+        started_at = dt_util.utcnow()
+        feed = self._announcements
+        since = dt_util.parse_datetime(feed.since) if feed.since else None
+        LOGGER.debug(
+            "Retrieving announcements for %s since %s", self.observee_id, since
+        )
+        try:
+            courses = await self._async_get_courses()
+            items = await self.client.async_get_announcements(
+                [course["id"] for course in courses],
+                since or started_at - ANNOUNCEMENT_LOOKBACK,
+            )
+        except CanvasLmsApiClientDeadlineError as exception:
+            # Pages are not ordered by date, merging some of them could move
+            # the cursor past announcements not fetched yet.
+            exception.partial = feed.as_dict()
+            raise
+        return self._merge_feed(feed, items, EVENT_NEW_ANNOUNCEMENT, started_at)
+
+    async def async_update_conversations(self) -> Any:
+        """
+        Sync the inbox conversations about obervees courses.
+
+        The inbox belongs to the observer, so one request is shared by every
+        observee and filtered by the context codes of the observee's courses.
+        """
+        started_at = dt_util.utcnow()
+        feed = self._conversations
+        LOGGER.debug(
+            "Retrieving conversations for %s since %s", self.observee_id, feed.since
+        )
+        try:
+            courses = await self._async_get_courses()
+            conversations = await self.client.async_get_conversations(
+                feed.since, limit=FEED_CACHE_SIZE
+            )
+        except CanvasLmsApiClientDeadlineError as exception:
+            exception.partial = feed.as_dict()
+            raise
+        context_codes = {f"course_{course['id']}" for course in courses}
+        items = [
+            conversation
+            for conversation in conversations
+            if conversation["context_code"] in context_codes
+        ]
+        return self._merge_feed(feed, items, EVENT_NEW_CONVERSATION_MESSAGE, started_at)
+
+    async def async_update_calendar(self) -> Any:
+        """
+        Update obervees calendar events from every course's ICS feed.
+
+        Feeds are downloaded concurrently, at most ``CALENDAR_FEED_CONCURRENCY``
+        at a time, and each event is tagged with its course. When the courses
+        refreshed by the coordinator carry no feed URL they are requested over
+        REST.
+        """
+        LOGGER.debug(f"Retrieving calendar feeds for {self.observee_id}")
+        semaphore = asyncio.Semaphore(CALENDAR_FEED_CONCURRENCY)
+
+        async def _async_get_feed(feed_url: str) -> Any:
+            async with semaphore:
+                return await self.client.async_get_calendar_events(feed_url)
+
+        try:
+            courses = await self._async_get_courses()
+            if self.courses is not None and not any(
+                course.get("calendar_ics") for course in courses
+            ):
+                # Courses read over GraphQL have no feed URL, REST has them.
+                courses = await self.client.async_get_courses(self.observee_id)
+            courses = [course for course in courses if course.get("calendar_ics")]
+            feeds = await asyncio.gather(
+                *(_async_get_feed(course["calendar_ics"]) for course in courses)
+            )
+        except CanvasLmsApiClientDeadlineError as exception:
+            # A partial course list is not a partial calendar.
+            exception.partial = None
+            raise
+        return [
+            {**event, "course_id": course["id"], "course": course["name"]}
+            for course, events in zip(courses, feeds, strict=True)
+            for event in events
+        ]
+
+    async def async_get_syllabus(
+        self, course_id: int, updated_at: str | None = None
+    ) -> str | None:
+        """
+        Return a course syllabus, fetching it only when the course changed.
+
+        Syllabi are cached per course and reused while the course's
+        ``updated_at`` is unchanged. When Canvas does not report
+        ``updated_at`` the cached syllabus is reused for ``SYLLABUS_CACHE_TTL``.
+        """
+        now = dt_util.utcnow()
+        cached = self._syllabi.get(course_id)
+        if cached is not None and cached.updated_at == updated_at:
+            expired = (
+                updated_at is None and now - cached.fetched_at >= SYLLABUS_CACHE_TTL
+            )
+            if not expired:
+                return cached.syllabus
+
+        LOGGER.debug(f"Retrieving syllabus for course {course_id}")
+        syllabus = await self.client.async_get_syllabus(course_id)
+        self._syllabi[course_id] = _CachedSyllabus(updated_at, now, syllabus)
+        return syllabus
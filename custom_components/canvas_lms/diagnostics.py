@@ -0,0 +1,49 @@
+"""Diagnostics support for canvas_lms_integration."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_ACCESS_TOKEN, CONF_WEBHOOK_ID
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .data import CanvasLmsConfigEntry
+
+TO_REDACT = {CONF_ACCESS_TOKEN, CONF_WEBHOOK_ID}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant,  # noqa: ARG001
+    entry: CanvasLmsConfigEntry,
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = entry.runtime_data
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "refresh": {
+            "last_update_success": coordinator.last_update_success,
+            "last_refresh_seconds": coordinator.last_refresh_seconds,
+            "latency": coordinator.refresh_latency.as_dict(),
+            "update_interval": str(coordinator.update_interval),
+            "next_refresh": {
+                key: due.isoformat() for key, due in coordinator.next_refresh.items()
+            },
+            "stale": coordinator.stale,
+            "partial": sorted(
+                f"{observee_id}/{key}" for observee_id, key in coordinator.partial
+            ),
+            "budget": str(coordinator.refresh_budget),
+        },
+        "observees": len(coordinator.observees),
+        "data": {
+            observee_id: {
+                key: len(value) if isinstance(value, list) else type(value).__name__
+                for key, value in observee_data.items()
+            }
+            for observee_id, observee_data in (coordinator.data or {}).items()
+        },
+        "endpoints": coordinator.client.metrics.as_dict(),
+    }
@@ -5,20 +5,101 @@ from __future__ import annotations
 import json
 from typing import TYPE_CHECKING, Any
 
+from homeassistant.core import callback
 from homeassistant.helpers.device_registry import DeviceEntryType
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.json import ExtendedJSONEncoder
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import ATTRIBUTION, DOMAIN, LOGGER, NAME, VERSION
+from .const import (
+    ATTRIBUTE_TEXT_MAX_CHARS,
+    ATTRIBUTION,
+    CONF_OBSERVEES,
+    DOMAIN,
+    LOGGER,
+    NAME,
+    VERSION,
+)
 from .coordinator import CanvasLmsDataUpdateCoordinator
 
 if TYPE_CHECKING:
-    from collections.abc import Mapping
+    from collections.abc import Callable
 
     from .data import CanvasLmsConfigEntry, CanvasLmsEntityDescription
 
 
+def fingerprint_items(
+    *fields: str, items_key: str | None = None
+) -> Callable[[Any], int]:
+    """
+    Return a function hashing the given fields of every item of a data value.
+
+    The coordinator compares these fingerprints between refreshes to notify
+    only the entities whose data changed. With ``items_key`` the items are
+    read from that key of a dict value.
+    """
+
+    def _fingerprint(data: Any) -> int:
+        items = (data or {}).get(items_key) if items_key else data
+        return hash(
+            tuple(tuple(item.get(field) for field in fields) for item in items or [])
+        )
+
+    return _fingerprint
+
+
+def _json_size(value: Any) -> int:
+    """Return the size of value once serialized to JSON."""
+    return len(json.dumps(value, separators=(",", ":")).encode())
+
+
+def _truncate_text(value: Any, max_chars: int) -> Any:
+    """Shorten every long string nested in lists and dicts of value."""
+    if isinstance(value, str) and len(value) > max_chars:
+        return f"{value[:max_chars]}…"
+    if isinstance(value, list):
+        return [_truncate_text(item, max_chars) for item in value]
+    if isinstance(value, dict):
+        return {key: _truncate_text(item, max_chars) for key, item in value.items()}
+    return value
+
+
+def _budget_attributes(attributes: dict[str, Any], max_bytes: int) -> dict[str, Any]:
+    """
+    Shrink JSON-ready attributes until they serialize within max_bytes.
+
+    Long text fields are cut to ``ATTRIBUTE_TEXT_MAX_CHARS`` first. When that
+    is not enough, items are dropped from the end of the largest lists. Any
+    shrinking is flagged with a ``truncated`` attribute.
+    """
+    if _json_size(attributes) <= max_bytes:
+        return attributes
+
+    attributes = _truncate_text(attributes, ATTRIBUTE_TEXT_MAX_CHARS)
+    attributes["truncated"] = True
+    size = _json_size(attributes)
+    if size <= max_bytes:
+        return attributes
+
+    item_sizes = {
+        key: [_json_size(item) + 1 for item in value]
+        for key, value in attributes.items()
+        if isinstance(value, list)
+    }
+    while size > max_bytes and any(item_sizes.values()):
+        key = max(item_sizes, key=lambda key: sum(item_sizes[key]))
+        size -= item_sizes[key].pop()
+        attributes[key] = attributes[key][: len(item_sizes[key])]
+
+    if _json_size(attributes) > max_bytes:
+        return {
+            key: value
+            for key, value in attributes.items()
+            if key in ("count", "truncated", "stale", "partial")
+        }
+    return attributes
+
+
 class CanvasLmsEntity(CoordinatorEntity[CanvasLmsDataUpdateCoordinator]):
     """CanvasLmsEntity class."""
 
@@ -29,11 +110,32 @@ class CanvasLmsEntity(CoordinatorEntity[CanvasLmsDataUpdateCoordinator]):
         coordinator: CanvasLmsDataUpdateCoordinator,
         description: CanvasLmsEntityDescription,
         config_entry: CanvasLmsConfigEntry,
+        observee_id: str | None = None,
     ) -> None:
-        """Initialize."""
-        super().__init__(coordinator)
-        self._attr_name = f"{config_entry.title} {description.name}"
-        self._attr_unique_id = f"{config_entry.entry_id}{description.key.lower()}"
+        """
+        Initialize.
+
+        Entities with an ``observee_id`` report that observee's data and are
+        named after them, and are only notified when that data key changed.
+        The data key is the description's ``data_key`` when it derives its
+        state from another key, else its ``key``. Entities without an
+        ``observee_id`` describe the whole entry.
+        """
+        self.data_key: str = getattr(description, "data_key", None) or description.key
+        super().__init__(
+            coordinator,
+            context=None if observee_id is None else (observee_id, self.data_key),
+        )
+        self.observee_id = observee_id
+        if observee_id is None:
+            self._attr_name = f"{config_entry.title} {description.name}"
+            self._attr_unique_id = f"{config_entry.entry_id}{description.key.lower()}"
+        else:
+            observee_name = config_entry.data[CONF_OBSERVEES][observee_id]
+            self._attr_name = f"{observee_name} {description.name}"
+            self._attr_unique_id = (
+                f"{config_entry.entry_id}_{observee_id}_{description.key.lower()}"
+            )
         LOGGER.debug(f"creating entity with _attr_unique_id of {self._attr_unique_id}")
         self._attr_device_info = DeviceInfo(
             identifiers={
@@ -58,15 +160,53 @@ class CanvasLmsEntity(CoordinatorEntity[CanvasLmsDataUpdateCoordinator]):
         )
 
     @property
-    def extra_state_attributes(self) -> Mapping[str, Any] | None:
-        """Return the extra state attributes."""
-        data = self.coordinator.data.get(self.entity_description.key)
-        if data and hasattr(self.entity_description, "attributes_fn"):
-            return json.loads(
-                json.dumps(
-                    self.entity_description.attributes_fn(data),
-                    cls=ExtendedJSONEncoder,
-                )
+    def available(self) -> bool:
+        """Return whether the data key is enabled and the last refresh worked."""
+        return super().available and (
+            self.observee_id is None
+            or self.coordinator.is_enabled(self.observee_id, self.data_key)
+        )
+
+    @property
+    def observee_data(self) -> dict[str, Any]:
+        """Return the coordinator data of this entity's observee."""
+        return (self.coordinator.data or {}).get(self.observee_id, {})
+
+    async def async_update(self) -> None:
+        """Refresh every data key when ``homeassistant.update_entity`` asks."""
+        if not self.enabled:
+            return
+        await self.coordinator.async_request_full_refresh()
+
+    async def async_added_to_hass(self) -> None:
+        """Build the attributes from the data available when added."""
+        await super().async_added_to_hass()
+        self._attr_extra_state_attributes = self._build_extra_state_attributes()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Rebuild the attributes once per coordinator update."""
+        self._attr_extra_state_attributes = self._build_extra_state_attributes()
+        super()._handle_coordinator_update()
+
+    def _build_extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the extra state attributes for the current coordinator data."""
+        data = self.observee_data.get(self.entity_description.key)
+        if not data or not hasattr(self.entity_description, "attributes_fn"):
+            return None
+
+        attributes = json.loads(
+            json.dumps(
+                self.entity_description.attributes_fn(data),
+                cls=ExtendedJSONEncoder,
             )
+        )
+        if attributes is None:
+            return None
 
-        return None
+        # Flagged before budgeting so the flags count toward the limit.
+        if self.coordinator.stale:
+            attributes["stale"] = True
+        if (self.observee_id, self.data_key) in self.coordinator.partial:
+            attributes["partial"] = True
+        return _budget_attributes(attributes, self.coordinator.attributes_max_bytes)
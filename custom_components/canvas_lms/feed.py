@@ -0,0 +1,77 @@
+"""Incrementally synced Canvas listings for canvas_lms_integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+
+class CanvasLmsFeed:
+    """
+    The newest items of a Canvas listing synced since a cursor.
+
+    Items are keyed by id and kept newest first by their ``time_key``, a UTC
+    ISO string. Beyond ``max_size`` the oldest items are evicted. ``since``
+    is the newest time seen, from which the next sync starts.
+    """
+
+    def __init__(
+        self,
+        time_key: str,
+        max_size: int,
+        items: list[dict[str, Any]] | None = None,
+        since: str | None = None,
+    ) -> None:
+        """Initialize the feed."""
+        self.time_key = time_key
+        self.max_size = max_size
+        self.since = since
+        self._items = {item["id"]: item for item in items or []}
+        self._evict()
+
+    @classmethod
+    def from_dict(
+        cls, time_key: str, max_size: int, data: dict[str, Any]
+    ) -> CanvasLmsFeed:
+        """Restore a feed from coordinator data."""
+        return cls(time_key, max_size, data.get("items"), data.get("since"))
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the feed as coordinator data, newest item first."""
+        return {"since": self.since, "items": list(self._items.values())}
+
+    def _time(self, item: dict[str, Any]) -> str:
+        """Return the sort key of an item."""
+        return item.get(self.time_key) or ""
+
+    def _evict(self) -> None:
+        """Sort the items newest first and drop those beyond max_size."""
+        newest = sorted(self._items.values(), key=self._time, reverse=True)
+        self._items = {item["id"]: item for item in newest[: self.max_size]}
+
+    def merge(
+        self, items: list[dict[str, Any]], started_at: str
+    ) -> list[dict[str, Any]]:
+        """
+        Add a sync's items and return the new ones, oldest first.
+
+        An item is new when its id was not seen or its time moved forward,
+        such as a conversation with a new message. Other known items are
+        updated in place, such as a conversation that was read. While the
+        feed is empty ``since`` is the time the sync started, so the next
+        sync is incremental as well.
+        """
+        new = []
+        for item in items:
+            current = self._items.get(item["id"])
+            if current is None or self._time(item) > self._time(current):
+                new.append(item)
+            self._items[item["id"]] = item
+        self._evict()
+        if self._items:
+            newest = self._time(next(iter(self._items.values())))
+            self.since = max(self.since or "", newest) or started_at
+        elif self.since is None:
+            self.since = started_at
+        return sorted(
+            (item for item in new if item["id"] in self._items), key=self._time
+        )
@@ -0,0 +1,194 @@
+"""Compact history of missing-assignment counts for canvas_lms_integration."""
+
+from __future__ import annotations
+
+import bisect
+from array import array
+from collections import Counter
+from typing import TYPE_CHECKING, Any
+
+from .const import HISTORY_COURSE_RETENTION, HISTORY_HEARTBEAT, HISTORY_SAMPLES
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from datetime import datetime
+
+    from .api import MissingAssignment
+
+
+class CountRing:
+    """
+    Fixed-size ring buffer of timestamped counts.
+
+    Timestamps and counts live in two preallocated arrays, so a series costs
+    12 bytes per sample however long it runs. Once full, each new sample
+    overwrites the oldest one.
+    """
+
+    __slots__ = ("_counts", "_length", "_start", "_times")
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize an empty buffer."""
+        self._times = array("d", [0.0]) * capacity
+        self._counts = array("I", [0]) * capacity
+        self._start = 0
+        self._length = 0
+
+    def __len__(self) -> int:
+        """Return the number of samples."""
+        return self._length
+
+    def _index(self, position: int) -> int:
+        """Return the array index of the sample at a position, oldest first."""
+        return (self._start + position) % len(self._times)
+
+    def append(self, timestamp: float, count: int) -> None:
+        """Add a sample, dropping the oldest one when full."""
+        capacity = len(self._times)
+        if self._length < capacity:
+            index = self._index(self._length)
+            self._length += 1
+        else:
+            index = self._start
+            self._start = (self._start + 1) % capacity
+        self._times[index] = timestamp
+        self._counts[index] = count
+
+    def samples(self) -> Iterator[tuple[float, int]]:
+        """Yield the samples, oldest first."""
+        for position in range(self._length):
+            index = self._index(position)
+            yield self._times[index], self._counts[index]
+
+    def last(self) -> tuple[float, int] | None:
+        """Return the newest sample."""
+        if not self._length:
+            return None
+        index = self._index(self._length - 1)
+        return self._times[index], self._counts[index]
+
+    def at(self, timestamp: float) -> tuple[float, int] | None:
+        """
+        Return the newest sample taken at or before a time.
+
+        Samples are only taken when the count changes, so this is the count
+        at that time. Returns the oldest sample when the history starts later.
+        """
+        if not self._length:
+            return None
+        position = bisect.bisect_right(
+            range(self._length), timestamp, key=lambda p: self._times[self._index(p)]
+        )
+        index = self._index(max(position - 1, 0))
+        return self._times[index], self._counts[index]
+
+    def total_since(self, timestamp: float) -> int:
+        """Return the sum of the counts sampled after a time."""
+        return sum(count for time, count in self.samples() if time > timestamp)
+
+    def as_list(self) -> list[list[float]]:
+        """Return the samples as ``[timestamp, count]`` pairs for storage."""
+        return [[time, count] for time, count in self.samples()]
+
+    @classmethod
+    def from_list(cls, capacity: int, samples: Iterable[Any]) -> CountRing:
+        """Restore a buffer from stored pairs."""
+        ring = cls(capacity)
+        for time, count in samples:
+            ring.append(float(time), int(count))
+        return ring
+
+
+class MissingAssignmentHistory:
+    """
+    Missing-assignment counts of one observee, in total and per course.
+
+    A sample is only appended when a count changes, or at least every
+    ``HISTORY_HEARTBEAT``, so a quiet week costs a handful of samples. The
+    number of assignments that became missing is kept as its own series.
+    Courses without missing assignments for ``HISTORY_COURSE_RETENTION`` are
+    forgotten.
+    """
+
+    def __init__(self, capacity: int = HISTORY_SAMPLES) -> None:
+        """Initialize an empty history."""
+        self.capacity = capacity
+        self.total = CountRing(capacity)
+        self.added = CountRing(capacity)
+        self.courses: dict[str, CountRing] = {}
+
+    def _append(self, ring: CountRing, timestamp: float, count: int) -> None:
+        """Sample a count when it changed or the heartbeat is due."""
+        if (last := ring.last()) is None or (
+            last[1] != count or timestamp - last[0] >= HISTORY_HEARTBEAT.total_seconds()
+        ):
+            ring.append(timestamp, count)
+
+    def record(
+        self, now: datetime, assignments: list[MissingAssignment], added: int
+    ) -> None:
+        """Sample the counts of a refresh, and how many assignments were added."""
+        timestamp = now.timestamp()
+        self._append(self.total, timestamp, len(assignments))
+        if added:
+            self.added.append(timestamp, added)
+
+        per_course = Counter(
+            assignment.get("course") or "" for assignment in assignments
+        )
+        for course in per_course.keys() - self.courses.keys():
+            self.courses[course] = CountRing(self.capacity)
+        retained_from = timestamp - HISTORY_COURSE_RETENTION.total_seconds()
+        for course, ring in list(self.courses.items()):
+            count = per_course.get(course, 0)
+            self._append(ring, timestamp, count)
+            if not count and all(
+                not sampled or time < retained_from for time, sampled in ring.samples()
+            ):
+                del self.courses[course]
+
+    def change(self, now: datetime, period: float) -> tuple[int, float] | None:
+        """Return the change of the total over a period and its start time."""
+        if (last := self.total.last()) is None:
+            return None
+        baseline = self.total.at(now.timestamp() - period)
+        if baseline is None:
+            return None
+        return last[1] - baseline[1], baseline[0]
+
+    def added_per_day(self, now: datetime, period: float) -> float:
+        """Return the assignments that became missing per day over a period."""
+        return self.added.total_since(now.timestamp() - period) * 86400 / period
+
+    def breakdown(self, now: datetime, period: float) -> dict[str, dict[str, int]]:
+        """Return the count of each course now and its change over a period."""
+        start = now.timestamp() - period
+        breakdown = {}
+        for course, ring in self.courses.items():
+            last, baseline = ring.last(), ring.at(start)
+            if last is None or baseline is None or not (last[1] or baseline[1]):
+                continue
+            breakdown[course] = {"count": last[1], "change": last[1] - baseline[1]}
+        return breakdown
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the history for storage."""
+        return {
+            "total": self.total.as_list(),
+            "added": self.added.as_list(),
+            "courses": {
+                course: ring.as_list() for course, ring in self.courses.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> MissingAssignmentHistory:
+        """Restore a history from storage."""
+        history = cls()
+        history.total = CountRing.from_list(history.capacity, data.get("total") or [])
+        history.added = CountRing.from_list(history.capacity, data.get("added") or [])
+        history.courses = {
+            course: CountRing.from_list(history.capacity, samples)
+            for course, samples in (data.get("courses") or {}).items()
+        }
+        return history
@@ -0,0 +1,125 @@
+"""Minimal iCalendar parsing of Canvas calendar feeds."""
+
+from __future__ import annotations
+
+from datetime import UTC, date, datetime, timedelta
+from typing import TYPE_CHECKING, Any
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+_TEXT_ESCAPES = {"n": "\n", "N": "\n", ",": ",", ";": ";", "\\": "\\"}
+
+# VEVENT properties kept, and the record field each one is stored as.
+_EVENT_FIELDS = {
+    "UID": "uid",
+    "SUMMARY": "summary",
+    "DESCRIPTION": "description",
+    "LOCATION": "location",
+    "URL": "url",
+}
+
+
+def _unfold(lines: Iterable[str]) -> Iterator[str]:
+    """Join folded content lines, yielding one logical line at a time."""
+    current: str | None = None
+    for line in lines:
+        if line[:1] in (" ", "\t"):
+            if current is not None:
+                current += line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line
+    if current is not None:
+        yield current
+
+
+def _unescape(value: str) -> str:
+    """Undo iCalendar TEXT escaping."""
+    if "\\" not in value:
+        return value
+    result = []
+    characters = iter(value)
+    for character in characters:
+        if character == "\\":
+            escaped = next(characters, "")
+            result.append(_TEXT_ESCAPES.get(escaped, escaped))
+        else:
+            result.append(character)
+    return "".join(result)
+
+
+def _split_property(line: str) -> tuple[str, dict[str, str], str]:
+    """Split a content line into its name, parameters and value."""
+    head, _, value = line.partition(":")
+    name, *parameters = head.split(";")
+    return (
+        name.upper(),
+        {
+            key.upper(): parameter_value
+            for key, _, parameter_value in (
+                parameter.partition("=") for parameter in parameters
+            )
+        },
+        value,
+    )
+
+
+def _parse_moment(value: str, parameters: dict[str, str]) -> date | datetime:
+    """Parse a DATE or DATE-TIME value, resolving TZID and UTC forms."""
+    if parameters.get("VALUE", "").upper() == "DATE" or len(value) == len("YYYYMMDD"):
+        return date(int(value[:4]), int(value[4:6]), int(value[6:8]))
+    moment = datetime.strptime(value.rstrip("Z"), "%Y%m%dT%H%M%S").replace(tzinfo=UTC)
+    if not value.endswith("Z") and (tzid := parameters.get("TZID")):
+        try:
+            return moment.replace(tzinfo=ZoneInfo(tzid.strip('"'))).astimezone(UTC)
+        except (ZoneInfoNotFoundError, ValueError):
+            pass
+    return moment
+
+
+def _finish_event(event: dict[str, Any]) -> dict[str, Any] | None:
+    """Complete an event record, or None when it has no start."""
+    start = event.pop("start", None)
+    if start is None:
+        return None
+    end = event.pop("end", None)
+    if end is None or type(end) is not type(start):
+        end = start + timedelta(days=1) if type(start) is date else start
+    event["all_day"] = type(start) is date
+    event["start"] = start.isoformat()
+    event["end"] = end.isoformat()
+    return event
+
+
+def parse_ics_events(lines: Iterable[str]) -> list[dict[str, Any]]:
+    """
+    Parse the VEVENTs of an iCalendar feed into event records.
+
+    Lines are consumed one at a time, so the feed never has to be split into
+    components first. Times are normalized to UTC; all-day events keep dates.
+    """
+    events: list[dict[str, Any]] = []
+    event: dict[str, Any] | None = None
+    for line in _unfold(lines):
+        name, parameters, value = _split_property(line)
+        if name == "BEGIN" and value.upper() == "VEVENT":
+            event = {}
+        elif event is None:
+            continue
+        elif name == "END" and value.upper() == "VEVENT":
+            if (finished := _finish_event(event)) is not None:
+                events.append(finished)
+            event = None
+        elif name in ("DTSTART", "DTEND"):
+            try:
+                event["start" if name == "DTSTART" else "end"] = _parse_moment(
+                    value, parameters
+                )
+            except ValueError:
+                continue
+        elif (field := _EVENT_FIELDS.get(name)) is not None:
+            event[field] = _unescape(value)
+    return events
@@ -0,0 +1,114 @@
+"""Lightweight timing and traffic metrics for canvas_lms_integration."""
+
+from __future__ import annotations
+
+import bisect
+import re
+from dataclasses import dataclass, field
+from typing import Any
+
+from yarl import URL
+
+# Upper bounds, in milliseconds, of the latency histogram buckets.
+LATENCY_BUCKETS_MS = (10, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_ID_SEGMENT = re.compile(r"/(?:\d+|self)(?=/|$)")
+# Calendar feed names carry a secret token, e.g. course_<token>.ics.
+_FEED_SEGMENT = re.compile(r"(/feeds/[^/]+)/[^/]+$")
+
+
+def endpoint_name(url: str | URL) -> str:
+    """
+    Return the URL path with ids replaced, e.g. /api/v1/users/:id/courses.
+
+    Feed names are replaced too, e.g. /feeds/calendars/:feed, so the metrics
+    neither grow per course nor expose the feeds' tokens.
+    """
+    path = _FEED_SEGMENT.sub(r"\1/:feed", URL(url).path)
+    return _ID_SEGMENT.sub("/:id", path)
+
+
+@dataclass(slots=True)
+class LatencyHistogram:
+    """Fixed-bucket histogram of durations."""
+
+    counts: list[int] = field(
+        default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1)
+    )
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Add one duration."""
+        milliseconds = seconds * 1000
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS_MS, milliseconds)] += 1
+        self.count += 1
+        self.total_ms += milliseconds
+        self.max_ms = max(self.max_ms, milliseconds)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram for diagnostics."""
+        labels = [f"<={bound}ms" for bound in LATENCY_BUCKETS_MS] + [
+            f">{LATENCY_BUCKETS_MS[-1]}ms"
+        ]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else None,
+            "max_ms": round(self.max_ms, 3),
+            "buckets": dict(zip(labels, self.counts, strict=True)),
+        }
+
+
+@dataclass(slots=True)
+class EndpointMetrics:
+    """Traffic and timings of one Canvas endpoint."""
+
+    requests: int = 0
+    errors: int = 0
+    not_modified: int = 0
+    response_bytes: int = 0
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    decode_seconds: float = 0.0
+    mapping_seconds: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics for diagnostics."""
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "not_modified": self.not_modified,
+            "response_bytes": self.response_bytes,
+            "latency": self.latency.as_dict(),
+            "decode_ms": round(self.decode_seconds * 1000, 3),
+            "mapping_ms": round(self.mapping_seconds * 1000, 3),
+        }
+
+
+class CanvasLmsMetrics:
+    """Per-endpoint request metrics collected by an API client."""
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.endpoints: dict[str, EndpointMetrics] = {}
+
+    def endpoint(self, url: str | URL) -> EndpointMetrics:
+        """Return the metrics of the endpoint url belongs to."""
+        name = endpoint_name(url)
+        if (metrics := self.endpoints.get(name)) is None:
+            metrics = self.endpoints[name] = EndpointMetrics()
+        return metrics
+
+    @property
+    def requests(self) -> int:
+        """Return the number of requests sent to Canvas."""
+        return sum(metrics.requests for metrics in self.endpoints.values())
+
+    @property
+    def response_bytes(self) -> int:
+        """Return the number of response body bytes received from Canvas."""
+        return sum(metrics.response_bytes for metrics in self.endpoints.values())
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics for diagnostics."""
+        return {name: metrics.as_dict() for name, metrics in self.endpoints.items()}
@@ -0,0 +1,138 @@
+"""Incrementally synced planner items for canvas_lms_integration."""
+
+from __future__ import annotations
+
+import bisect
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.util import dt as dt_util
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+
+def _iso(moment: datetime) -> str:
+    """Return a moment as the UTC ISO string planner items are sorted by."""
+    return dt_util.as_utc(moment).isoformat(timespec="seconds")
+
+
+def _due(item: dict[str, Any]) -> str:
+    """Return the sort key of a planner item, its UTC ISO due date."""
+    return item["due_at"]
+
+
+def _item_key(item: dict[str, Any]) -> tuple[str, Any]:
+    """Return the identity of a planner item."""
+    return item["type"], item["id"]
+
+
+def due_between(
+    items: list[dict[str, Any]], start: datetime, end: datetime
+) -> list[dict[str, Any]]:
+    """Return the items of a due-sorted list that are due in [start, end)."""
+    low = bisect.bisect_left(items, _iso(start), key=_due)
+    high = bisect.bisect_left(items, _iso(end), lo=low, key=_due)
+    return items[low:high]
+
+
+def next_due(
+    items: list[dict[str, Any]], now: datetime, count: int
+) -> list[dict[str, Any]]:
+    """Return the first count items of a due-sorted list due from now on."""
+    low = bisect.bisect_left(items, _iso(now), key=_due)
+    return items[low : low + count]
+
+
+class CanvasLmsPlannerIndex:
+    """
+    Planner items of one observee, sorted by due date.
+
+    ``synced_until`` is the end of the date window synced so far and
+    ``synced_at`` when the whole window was last fetched. Windows are merged
+    in place, keeping the record of every item that did not change.
+    """
+
+    def __init__(
+        self,
+        items: list[dict[str, Any]] | None = None,
+        synced_until: datetime | None = None,
+        synced_at: datetime | None = None,
+    ) -> None:
+        """Initialize the index."""
+        self.items = sorted(items or [], key=_due)
+        self.synced_until = synced_until
+        self.synced_at = synced_at
+        self._due = {_item_key(item): _due(item) for item in self.items}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> CanvasLmsPlannerIndex:
+        """Restore an index from coordinator data."""
+        return cls(
+            data.get("items"),
+            dt_util.parse_datetime(data.get("synced_until") or ""),
+            dt_util.parse_datetime(data.get("synced_at") or ""),
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the index as coordinator data."""
+        return {
+            "synced_until": self.synced_until.isoformat()
+            if self.synced_until
+            else None,
+            "synced_at": self.synced_at.isoformat() if self.synced_at else None,
+            "items": list(self.items),
+        }
+
+    def prune(self, before: datetime) -> None:
+        """Drop the items due before a date."""
+        low = bisect.bisect_left(self.items, _iso(before), key=_due)
+        for item in self.items[:low]:
+            del self._due[_item_key(item)]
+        del self.items[:low]
+
+    def merge_window(
+        self, start: datetime, end: datetime, items: list[dict[str, Any]]
+    ) -> int:
+        """
+        Replace the items due in [start, end) with a fresh fetch of the window.
+
+        Returns how many items were added, changed or removed. Items whose due
+        date moved into the window are moved rather than duplicated.
+        """
+        window_start, window_end = _iso(start), _iso(end)
+        fetched = {
+            _item_key(item): item
+            for item in items
+            if window_start <= _due(item) < window_end
+        }
+        for key in fetched:
+            due = self._due.get(key)
+            if due is not None and not window_start <= due < window_end:
+                self._remove(key, due)
+
+        low = bisect.bisect_left(self.items, window_start, key=_due)
+        high = bisect.bisect_left(self.items, window_end, lo=low, key=_due)
+        current = {_item_key(item): item for item in self.items[low:high]}
+        changed = len(current.keys() - fetched.keys())
+        window = []
+        for key, item in fetched.items():
+            if current.get(key) == item:
+                window.append(current[key])
+                continue
+            changed += 1
+            window.append(item)
+        for key in current.keys() - fetched.keys():
+            del self._due[key]
+        for key, item in fetched.items():
+            self._due[key] = _due(item)
+        self.items[low:high] = sorted(window, key=_due)
+        return changed
+
+    def _remove(self, key: tuple[str, Any], due: str) -> None:
+        """Remove one item, located by its due date."""
+        index = bisect.bisect_left(self.items, due, key=_due)
+        while index < len(self.items) and _due(self.items[index]) == due:
+            if _item_key(self.items[index]) == key:
+                del self.items[index]
+                return
+            index += 1
@@ -0,0 +1,228 @@
+"""Push-triggered refreshes of canvas_lms_integration through a webhook."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any
+
+from aiohttp import web
+from homeassistant.components import webhook
+from homeassistant.const import CONF_WEBHOOK_ID
+from homeassistant.core import callback
+
+from .const import (
+    CONF_PUSH,
+    LOGGER,
+    NAME,
+    Announcements,
+    Calendar,
+    Conversations,
+    Courses,
+    Grades,
+    MissingAssignments,
+    UpcomingAssignments,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from homeassistant.core import HomeAssistant
+
+    from .coordinator import CanvasLmsDataUpdateCoordinator, DataSlot
+    from .data import CanvasLmsConfigEntry
+
+# Data keys affected by each Canvas Live Events event and notification
+# category, the latter lowercased with spaces replaced by underscores.
+EVENT_KEYS: dict[str, tuple[str, ...]] = {
+    "submission_created": (MissingAssignments, UpcomingAssignments),
+    "submission_updated": (MissingAssignments, UpcomingAssignments),
+    "grade_change": (Grades, MissingAssignments, UpcomingAssignments),
+    "assignment_created": (MissingAssignments, UpcomingAssignments, Calendar),
+    "assignment_updated": (MissingAssignments, UpcomingAssignments, Calendar),
+    "assignment_override_created": (UpcomingAssignments, Calendar),
+    "assignment_override_updated": (UpcomingAssignments, Calendar),
+    "enrollment_created": (Courses, Grades),
+    "enrollment_updated": (Courses, Grades),
+    "enrollment_state_updated": (Courses, Grades),
+    "course_updated": (Courses,),
+    "calendar_event_created": (Calendar,),
+    "calendar_event_updated": (Calendar,),
+    "discussion_topic_created": (Announcements,),
+    "conversation_created": (Conversations,),
+    "conversation_message_created": (Conversations,),
+    "due_date": (UpcomingAssignments, Calendar),
+    "grading": (Grades, MissingAssignments, UpcomingAssignments),
+    "late_grading": (Grades, MissingAssignments, UpcomingAssignments),
+    "calendar": (Calendar,),
+    "announcement": (Announcements,),
+    "conversation_message": (Conversations,),
+    "added_to_conversation": (Conversations,),
+}
+
+# Canvas global ids put the shard above the local id, e.g. 21070000000000123.
+_SHARD_FACTOR = 10**13
+
+
+@dataclass(frozen=True, slots=True)
+class CanvasLmsPushEvent:
+    """A Canvas event, the data keys it affects and whom it concerns."""
+
+    name: str
+    keys: tuple[str, ...]
+    user_ids: tuple[str, ...]
+    course_ids: tuple[str, ...]
+
+
+def _local_ids(*values: Any) -> tuple[str, ...]:
+    """Return the distinct ids among values, global ids as local ids."""
+    ids: list[str] = []
+    for value in values:
+        if value is None or not str(value).isdigit():
+            continue
+        for candidate in (str(value), str(int(value) % _SHARD_FACTOR)):
+            if candidate not in ids:
+                ids.append(candidate)
+    return tuple(ids)
+
+
+def _course_id(container: dict[str, Any]) -> Any:
+    """Return the course id of an event body or metadata, if any."""
+    if (course_id := container.get("course_id")) is not None:
+        return course_id
+    if container.get("context_type") == "Course":
+        return container.get("context_id")
+    return None
+
+
+def parse_push_event(payload: Any) -> CanvasLmsPushEvent | None:
+    """
+    Map one pushed payload to the data keys it affects.
+
+    Live Events payloads carry the event name in ``metadata`` and the record
+    in ``body``; relays may post flat payloads with ``event_name`` or a
+    notification ``category`` instead. The affected students are read from
+    the body first, since the metadata names the acting user, who is the
+    teacher for grade changes. Unknown events return None.
+    """
+    if not isinstance(payload, dict):
+        return None
+    metadata = payload.get("metadata")
+    metadata = metadata if isinstance(metadata, dict) else {}
+    body = payload.get("body")
+    body = body if isinstance(body, dict) else payload
+
+    name = str(
+        metadata.get("event_name")
+        or payload.get("event_name")
+        or payload.get("category")
+        or ""
+    )
+    keys = EVENT_KEYS.get(name.strip().lower().replace(" ", "_"))
+    if keys is None:
+        return None
+    return CanvasLmsPushEvent(
+        name=name,
+        keys=keys,
+        user_ids=_local_ids(
+            body.get("student_id"),
+            body.get("user_id"),
+            payload.get("student_id"),
+            payload.get("user_id"),
+            metadata.get("user_id"),
+        ),
+        course_ids=_local_ids(
+            _course_id(body), _course_id(payload), _course_id(metadata)
+        ),
+    )
+
+
+def event_slots(
+    coordinator: CanvasLmsDataUpdateCoordinator, event: CanvasLmsPushEvent
+) -> set[DataSlot]:
+    """
+    Return the observee data keys an event affects.
+
+    The observees are those the event names, otherwise those enrolled in its
+    course, otherwise every observee of the entry.
+    """
+    observee_ids = [
+        observee_id
+        for observee_id in event.user_ids
+        if observee_id in coordinator.observees
+    ]
+    if not observee_ids and event.course_ids:
+        observee_ids = [
+            observee_id
+            for observee_id, observee_data in (coordinator.data or {}).items()
+            if any(
+                str(course["id"]) in event.course_ids
+                for course in observee_data.get(Courses) or []
+            )
+        ]
+    if not observee_ids:
+        observee_ids = list(coordinator.observees)
+    return {(observee_id, key) for observee_id in observee_ids for key in event.keys}
+
+
+@callback
+def async_register_webhook(
+    hass: HomeAssistant, entry: CanvasLmsConfigEntry
+) -> Callable[[], None]:
+    """
+    Register the push webhook of an entry, returning its unregister callback.
+
+    The webhook id is generated the first time push mode is enabled and kept
+    in the entry data, so the URL given to the relay stays the same.
+    """
+    if (webhook_id := entry.data.get(CONF_WEBHOOK_ID)) is None:
+        webhook_id = webhook.async_generate_id()
+        hass.config_entries.async_update_entry(
+            entry, data={**entry.data, CONF_WEBHOOK_ID: webhook_id}
+        )
+        # The webhook id is a secret, its URL is only shown in the options.
+        LOGGER.debug("Generated the Canvas LMS push webhook of %s", entry.title)
+
+    async def _async_handle_webhook(
+        hass: HomeAssistant,  # noqa: ARG001
+        webhook_id: str,  # noqa: ARG001
+        request: web.Request,
+    ) -> web.Response | None:
+        """Refresh the data keys affected by the pushed events."""
+        try:
+            payload = await request.json()
+        except ValueError:
+            return web.Response(status=HTTPStatus.BAD_REQUEST)
+
+        coordinator = entry.runtime_data
+        slots: set[DataSlot] = set()
+        for item in payload if isinstance(payload, list) else [payload]:
+            if (event := parse_push_event(item)) is None:
+                LOGGER.debug("Ignoring pushed payload %s", item)
+                continue
+            slots |= event_slots(coordinator, event)
+        if slots:
+            await coordinator.async_request_push_refresh(slots)
+        return None
+
+    webhook.async_register(
+        hass,
+        entry.domain,
+        f"{NAME} {entry.title}",
+        webhook_id,
+        _async_handle_webhook,
+        allowed_methods=["POST"],
+    )
+    return lambda: webhook.async_unregister(hass, webhook_id)
+
+
+@callback
+def async_update_webhook(hass: HomeAssistant, entry: CanvasLmsConfigEntry) -> None:
+    """Register or unregister the push webhook to follow the push option."""
+    coordinator = entry.runtime_data
+    if entry.options.get(CONF_PUSH):
+        if coordinator.unregister_webhook is None:
+            coordinator.unregister_webhook = async_register_webhook(hass, entry)
+    elif coordinator.unregister_webhook is not None:
+        coordinator.unregister_webhook()
+        coordinator.unregister_webhook = None
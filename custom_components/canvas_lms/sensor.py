@@ -3,22 +3,51 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from datetime import timedelta
 from typing import TYPE_CHECKING, Any
 
-from homeassistant.components.sensor import SensorEntity, SensorEntityDescription
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import EntityCategory, UnitOfInformation, UnitOfTime
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN, LOGGER, Courses, MissingAssignments
+from .const import (
+    FEED_ATTRIBUTE_ITEMS,
+    LOGGER,
+    TREND_PERIOD,
+    UPCOMING_ATTRIBUTE_ITEMS,
+    Announcements,
+    Conversations,
+    Courses,
+    Grades,
+    MissingAssignments,
+    MissingAssignmentsByCourse,
+    MissingAssignmentsChange,
+    MissingAssignmentsRate,
+    RefreshDuration,
+    Requests,
+    ResponseBytes,
+    UpcomingAssignments,
+)
 from .coordinator import CanvasLmsDataUpdateCoordinator
-from .entity import CanvasLmsEntity
+from .entity import CanvasLmsEntity, fingerprint_items
+from .planner import due_between, next_due
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Mapping
+    from collections.abc import Callable, Hashable, Mapping
+    from datetime import datetime
 
     from homeassistant.core import HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
+    from homeassistant.helpers.typing import StateType
 
     from .coordinator import CanvasLmsDataUpdateCoordinator
     from .data import CanvasLmsConfigEntry
+    from .history import MissingAssignmentHistory
 
 
 @dataclass
@@ -26,7 +55,140 @@ class CanvasLmsEntityDescription(SensorEntityDescription):
     """Canvas LMS sensor entity description."""
 
     attributes_fn: Callable[[list[Any]], Mapping[str, Any] | None] = lambda _: None
+    value_fn: Callable[[Any], StateType] = lambda data: len(data) if data else 0
+    fingerprint_fn: Callable[[Any], Hashable] | None = None
     entity_registry_enabled_default: bool = False
+    update_interval: timedelta = timedelta(hours=1)
+    update_interval_fn: Callable[[list[Any]], timedelta | None] = lambda _: None
+
+
+@dataclass
+class CanvasLmsTrendEntityDescription(SensorEntityDescription):
+    """Canvas LMS sensor entity description derived from the count history."""
+
+    data_key: str = MissingAssignments
+    value_fn: Callable[[MissingAssignmentHistory, datetime], StateType] = lambda *_: (
+        None
+    )
+    attributes_fn: Callable[
+        [MissingAssignmentHistory, datetime], Mapping[str, Any] | None
+    ] = lambda *_: None
+    state_class: SensorStateClass | None = SensorStateClass.MEASUREMENT
+    entity_registry_enabled_default: bool = False
+    update_interval: timedelta = timedelta(hours=4)
+
+
+@dataclass
+class CanvasLmsDiagnosticEntityDescription(SensorEntityDescription):
+    """Canvas LMS diagnostic sensor entity description."""
+
+    value_fn: Callable[[CanvasLmsDataUpdateCoordinator], StateType] = lambda _: None
+    entity_category: EntityCategory | None = EntityCategory.DIAGNOSTIC
+    entity_registry_enabled_default: bool = False
+
+
+def _missing_assignments_update_interval(data: list[Any]) -> timedelta | None:
+    """Poll more often while a missing assignment is close to a deadline."""
+    now = dt_util.utcnow()
+    distances = [
+        abs(deadline - now)
+        for assignment in data
+        for value in (assignment["due_date"], assignment["locks_at"])
+        if value and (deadline := dt_util.parse_datetime(value))
+    ]
+    if not distances:
+        return None
+    closest = min(distances)
+    if closest < timedelta(days=1):
+        return timedelta(minutes=15)
+    if closest < timedelta(days=3):
+        return timedelta(hours=1)
+    return None
+
+
+def _upcoming_assignments_attributes(data: dict[str, Any]) -> Mapping[str, Any]:
+    """Summarize the planner index with the next items and today's items."""
+    items = data["items"]
+    today = dt_util.start_of_local_day()
+    return {
+        "next_due": next_due(items, dt_util.utcnow(), UPCOMING_ATTRIBUTE_ITEMS),
+        "due_today": due_between(items, today, today + timedelta(days=1)),
+        "synced_until": data["synced_until"],
+        "count": len(items),
+    }
+
+
+_upcoming_items_fingerprint = fingerprint_items(
+    "type",
+    "id",
+    "due_at",
+    "updated_at",
+    "submitted",
+    "missing",
+    "graded",
+    items_key="items",
+)
+
+
+def _upcoming_assignments_fingerprint(data: dict[str, Any]) -> Hashable:
+    """
+    Fingerprint the planner items and the time the attributes depend on.
+
+    ``next_due`` and ``due_today`` change as items fall due and at midnight,
+    so the local day and the number of items already due are included.
+    """
+    items = (data or {}).get("items") or []
+    now = dt_util.utcnow()
+    return (
+        _upcoming_items_fingerprint(data),
+        dt_util.start_of_local_day(),
+        len(items) - len(next_due(items, now, len(items))),
+    )
+
+
+def _announcements_attributes(data: dict[str, Any]) -> Mapping[str, Any]:
+    """Summarize the cached announcements with the latest ones."""
+    items = data["items"]
+    return {
+        "announcements": items[:FEED_ATTRIBUTE_ITEMS],
+        "since": data["since"],
+        "count": len(items),
+    }
+
+
+def _conversations_attributes(data: dict[str, Any]) -> Mapping[str, Any]:
+    """Summarize the cached conversations with the latest ones."""
+    items = data["items"]
+    return {
+        "conversations": items[:FEED_ATTRIBUTE_ITEMS],
+        "since": data["since"],
+        "count": len(items),
+    }
+
+
+def _missing_assignments_change(
+    history: MissingAssignmentHistory, now: datetime
+) -> StateType:
+    """Return how many more assignments are missing than a period ago."""
+    change = history.change(now, TREND_PERIOD.total_seconds())
+    return None if change is None else change[0]
+
+
+def _missing_assignments_change_attributes(
+    history: MissingAssignmentHistory, now: datetime
+) -> Mapping[str, Any] | None:
+    """Return when the compared count was sampled."""
+    change = history.change(now, TREND_PERIOD.total_seconds())
+    if change is None:
+        return None
+    return {"since": dt_util.utc_from_timestamp(change[1]).isoformat()}
+
+
+def _missing_assignments_by_course(
+    history: MissingAssignmentHistory, now: datetime
+) -> Mapping[str, Any]:
+    """Return the count and change of every course with missing work."""
+    return {"courses": history.breakdown(now, TREND_PERIOD.total_seconds())}
 
 
 ENTITY_DESCRIPTIONS = (
@@ -35,40 +197,220 @@ ENTITY_DESCRIPTIONS = (
         name="Canvas LMS Missing Assignments",
         icon="mdi:format-quote-close",
         attributes_fn=lambda data: {"assignments": data, "count": len(data)},
+        update_interval=timedelta(hours=4),
+        update_interval_fn=_missing_assignments_update_interval,
+        # Every field is shown in the attributes, descriptions included.
+        fingerprint_fn=fingerprint_items(
+            "id",
+            "name",
+            "due_date",
+            "locks_at",
+            "course",
+            "course_og_name",
+            "description",
+        ),
     ),
     CanvasLmsEntityDescription(
         key=Courses,
         name="Canvas LMS Courses",
         icon="mdi:format-quote-close",
         attributes_fn=lambda data: {"courses": data, "count": len(data)},
+        update_interval=timedelta(hours=12),
+        fingerprint_fn=fingerprint_items("id", "updated_at"),
+    ),
+    CanvasLmsEntityDescription(
+        key=Grades,
+        name="Canvas LMS Grades",
+        icon="mdi:school",
+        attributes_fn=lambda data: {"grades": data, "count": len(data)},
+        update_interval=timedelta(hours=4),
+        fingerprint_fn=fingerprint_items(
+            "course_id",
+            "current_grade",
+            "current_score",
+            "final_grade",
+            "final_score",
+            "html_url",
+            "last_activity_at",
+            "updated_at",
+        ),
+    ),
+    CanvasLmsEntityDescription(
+        key=UpcomingAssignments,
+        name="Canvas LMS Upcoming Assignments",
+        icon="mdi:calendar-clock",
+        attributes_fn=_upcoming_assignments_attributes,
+        value_fn=lambda data: len(data["items"]) if data else 0,
+        update_interval=timedelta(hours=1),
+        fingerprint_fn=_upcoming_assignments_fingerprint,
+    ),
+    CanvasLmsEntityDescription(
+        key=Announcements,
+        name="Canvas LMS Announcements",
+        icon="mdi:bullhorn",
+        attributes_fn=_announcements_attributes,
+        value_fn=lambda data: len(data["items"]) if data else 0,
+        update_interval=timedelta(hours=1),
+        fingerprint_fn=fingerprint_items("id", "posted_at", items_key="items"),
+    ),
+    CanvasLmsEntityDescription(
+        key=Conversations,
+        name="Canvas LMS Unread Conversations",
+        icon="mdi:email",
+        attributes_fn=_conversations_attributes,
+        value_fn=lambda data: (
+            sum(item["unread"] for item in data["items"]) if data else 0
+        ),
+        update_interval=timedelta(minutes=30),
+        fingerprint_fn=fingerprint_items(
+            "id", "last_message_at", "unread", items_key="items"
+        ),
+    ),
+)
+
+TREND_DESCRIPTIONS = (
+    CanvasLmsTrendEntityDescription(
+        key=MissingAssignmentsChange,
+        name="Canvas LMS Missing Assignments Weekly Change",
+        icon="mdi:trending-up",
+        value_fn=_missing_assignments_change,
+        attributes_fn=_missing_assignments_change_attributes,
+    ),
+    CanvasLmsTrendEntityDescription(
+        key=MissingAssignmentsRate,
+        name="Canvas LMS New Missing Assignments",
+        icon="mdi:speedometer",
+        native_unit_of_measurement="assignments/d",
+        suggested_display_precision=2,
+        value_fn=lambda history, now: history.added_per_day(
+            now, TREND_PERIOD.total_seconds()
+        ),
+    ),
+    CanvasLmsTrendEntityDescription(
+        key=MissingAssignmentsByCourse,
+        name="Canvas LMS Courses With Missing Assignments",
+        icon="mdi:book-alert",
+        value_fn=lambda history, _: sum(
+            1
+            for course in history.courses.values()
+            if (last := course.last()) and last[1]
+        ),
+        attributes_fn=_missing_assignments_by_course,
+    ),
+)
+
+DIAGNOSTIC_DESCRIPTIONS = (
+    CanvasLmsDiagnosticEntityDescription(
+        key=Requests,
+        name="Canvas LMS Requests",
+        icon="mdi:counter",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.client.metrics.requests,
+    ),
+    CanvasLmsDiagnosticEntityDescription(
+        key=ResponseBytes,
+        name="Canvas LMS Downloaded",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.client.metrics.response_bytes,
+    ),
+    CanvasLmsDiagnosticEntityDescription(
+        key=RefreshDuration,
+        name="Canvas LMS Refresh Duration",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        value_fn=lambda coordinator: coordinator.last_refresh_seconds,
     ),
 )
 
 
 async def async_setup_entry(
-    hass: HomeAssistant,
+    hass: HomeAssistant,  # noqa: ARG001
     entry: CanvasLmsConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the sensor platform."""
-    coordinator: CanvasLmsDataUpdateCoordinator = hass.data[DOMAIN]
-    entities = []
-    for description in ENTITY_DESCRIPTIONS:
-        entity = CanvasLmsSensor(coordinator, description, entry)
-        coordinator.entities.append(entity)
-        entities.append(entity)
+    coordinator = entry.runtime_data
+    entities: list[CanvasLmsEntity] = []
+    for observee_id in coordinator.observees:
+        for description in ENTITY_DESCRIPTIONS:
+            entity = CanvasLmsSensor(coordinator, description, entry, observee_id)
+            coordinator.entities.append(entity)
+            entities.append(entity)
+    # Added after the data sensors, which then describe the data key to fetch.
+    for observee_id in coordinator.observees:
+        for description in TREND_DESCRIPTIONS:
+            entity = CanvasLmsTrendSensor(coordinator, description, entry, observee_id)
+            coordinator.entities.append(entity)
+            entities.append(entity)
+    entities.extend(
+        CanvasLmsDiagnosticSensor(coordinator, description, entry)
+        for description in DIAGNOSTIC_DESCRIPTIONS
+    )
 
-    async_add_entities(entities, True)  # noqa: FBT003
+    async_add_entities(entities)
 
 
 class CanvasLmsSensor(CanvasLmsEntity, SensorEntity):
     """integration_blueprint Sensor class."""
 
+    entity_description: CanvasLmsEntityDescription
+
     @property
-    def native_value(self) -> str | None:
+    def native_value(self) -> StateType:
         """Return the native value of the sensor."""
-        entity_data = self.coordinator.data.get(self.entity_description.key, None)
+        entity_data = self.observee_data.get(self.entity_description.key)
         LOGGER.debug(
-            f"retrieved entity_data {entity_data} for {self.entity_description}"
+            "retrieved entity_data %s for %s", entity_data, self.entity_description
         )
-        return len(entity_data) if entity_data else 0
+        return self.entity_description.value_fn(entity_data)
+
+
+class CanvasLmsTrendSensor(CanvasLmsEntity, SensorEntity):
+    """Sensor reporting a trend of an observee's missing assignments."""
+
+    entity_description: CanvasLmsTrendEntityDescription
+
+    def __init__(
+        self,
+        coordinator: CanvasLmsDataUpdateCoordinator,
+        description: CanvasLmsTrendEntityDescription,
+        config_entry: CanvasLmsConfigEntry,
+        observee_id: str,
+    ) -> None:
+        """
+        Initialize.
+
+        Trends move with time even when the missing assignments do not, so
+        these sensors are notified of every refresh.
+        """
+        super().__init__(coordinator, description, config_entry, observee_id)
+        self.coordinator_context = None
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the native value of the sensor."""
+        if (history := self.coordinator.history.get(self.observee_id)) is None:
+            return None
+        return self.entity_description.value_fn(history, dt_util.utcnow())
+
+    def _build_extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the extra state attributes for the current history."""
+        if (history := self.coordinator.history.get(self.observee_id)) is None:
+            return None
+        attributes = self.entity_description.attributes_fn(history, dt_util.utcnow())
+        return None if attributes is None else dict(attributes)
+
+
+class CanvasLmsDiagnosticSensor(CanvasLmsEntity, SensorEntity):
+    """Sensor reporting the integration's own load on Canvas."""
+
+    entity_description: CanvasLmsDiagnosticEntityDescription
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the native value of the sensor."""
+        return self.entity_description.value_fn(self.coordinator)
@@ -0,0 +1,87 @@
+"""Services for canvas_lms_integration."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import voluptuous as vol
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import SupportsResponse
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+
+from .api import CanvasLmsApiClientError
+from .const import (
+    CONF_CONFIG_ENTRY_ID,
+    CONF_COURSE_ID,
+    DOMAIN,
+    SERVICE_GET_SYLLABUS,
+    Courses,
+)
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse
+
+    from .coordinator import CanvasLmsDataUpdateCoordinator
+    from .data import CanvasLmsConfigEntry
+
+GET_SYLLABUS_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(CONF_COURSE_ID): vol.Coerce(int),
+    }
+)
+
+
+def _async_get_coordinator(
+    hass: HomeAssistant, entry_id: str
+) -> CanvasLmsDataUpdateCoordinator:
+    """Return the coordinator of a loaded config entry."""
+    entry: CanvasLmsConfigEntry | None = hass.config_entries.async_get_entry(entry_id)
+    if (
+        entry is None
+        or entry.domain != DOMAIN
+        or entry.state is not ConfigEntryState.LOADED
+    ):
+        msg = f"Canvas LMS entry {entry_id} is not loaded"
+        raise ServiceValidationError(msg)
+    return entry.runtime_data
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Canvas LMS services."""
+
+    async def _async_get_syllabus(call: ServiceCall) -> ServiceResponse:
+        """Return the syllabus of a course, fetched on demand."""
+        coordinator = _async_get_coordinator(hass, call.data[CONF_CONFIG_ENTRY_ID])
+        course_id = call.data[CONF_COURSE_ID]
+        # Syllabi are cached per observee, so ask one enrolled in the course.
+        observee_id, course = next(
+            (
+                (observee_id, course)
+                for observee_id, observee_data in (coordinator.data or {}).items()
+                for course in observee_data.get(Courses) or []
+                if course["id"] == course_id
+            ),
+            (next(iter(coordinator.observees)), {}),
+        )
+        try:
+            syllabus = await coordinator.observees[observee_id].async_get_syllabus(
+                course_id, course.get("updated_at")
+            )
+        except CanvasLmsApiClientError as exception:
+            raise HomeAssistantError(exception) from exception
+
+        return {
+            "course_id": course_id,
+            "name": course.get("name"),
+            "syllabus": syllabus,
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_SYLLABUS,
+        _async_get_syllabus,
+        schema=GET_SYLLABUS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
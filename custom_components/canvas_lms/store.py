@@ -0,0 +1,89 @@
+"""Persistent snapshots of coordinator data for canvas_lms_integration."""
+
+from __future__ import annotations
+
+import base64
+import json
+import zlib
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.helpers.json import ExtendedJSONEncoder
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, LOGGER, SNAPSHOT_SAVE_DELAY, SNAPSHOT_STORAGE_VERSION
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from homeassistant.core import HomeAssistant
+
+
+@dataclass(slots=True)
+class CanvasLmsSnapshot:
+    """Coordinator data restored from disk."""
+
+    saved_at: datetime
+    data: dict[str, Any]
+    history: dict[str, Any]
+
+
+def _encode(data: dict[str, Any]) -> str:
+    """Serialize and compress coordinator data."""
+    raw = json.dumps(data, cls=ExtendedJSONEncoder).encode()
+    return base64.b64encode(zlib.compress(raw)).decode()
+
+
+def _decode(payload: str) -> dict[str, Any]:
+    """Decompress and deserialize coordinator data."""
+    return json.loads(zlib.decompress(base64.b64decode(payload)))
+
+
+class CanvasLmsSnapshotStore:
+    """Store the last successful coordinator data for one config entry."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the store."""
+        self.hass = hass
+        self._store: Store[dict[str, Any]] = Store(
+            hass, SNAPSHOT_STORAGE_VERSION, f"{DOMAIN}.{entry_id}"
+        )
+
+    async def async_load(self) -> CanvasLmsSnapshot | None:
+        """Load the snapshot, or None when there is no usable one."""
+        try:
+            stored = await self._store.async_load()
+            if not stored:
+                return None
+            data = await self.hass.async_add_executor_job(_decode, stored["payload"])
+        except (KeyError, ValueError, TypeError, zlib.error, NotImplementedError):
+            LOGGER.warning("Ignoring unreadable Canvas LMS snapshot")
+            return None
+
+        saved_at = dt_util.parse_datetime(stored.get("saved_at", ""))
+        if saved_at is None:
+            return None
+        return CanvasLmsSnapshot(
+            saved_at=saved_at, data=data, history=stored.get("history") or {}
+        )
+
+    async def async_save(
+        self, data: dict[str, Any], history: dict[str, Any] | None = None
+    ) -> None:
+        """
+        Schedule the data to be written as the new snapshot.
+
+        The count history is small and stored as is next to the payload.
+        """
+        payload = await self.hass.async_add_executor_job(_encode, data)
+        stored = {
+            "saved_at": dt_util.utcnow().isoformat(),
+            "payload": payload,
+            "history": history or {},
+        }
+        self._store.async_delay_save(lambda: stored, SNAPSHOT_SAVE_DELAY)
+
+    async def async_remove(self) -> None:
+        """Delete the snapshot from disk."""
+        await self._store.async_remove()